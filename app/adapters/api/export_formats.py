@@ -0,0 +1,123 @@
+# /app/adapters/api/export_formats.py
+"""
+Byte-stream encoders for ExportService rows: NDJSON, and (with the optional pyarrow
+dependency) Parquet or an Arrow IPC stream. Each encoder consumes rows lazily and
+yields bytes as it goes, so an export never holds more than one batch in memory.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from itertools import islice
+from typing import Any
+
+from app.domain.export_service import EXPORT_COLUMNS
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+COLUMNAR = frozenset({"parquet", "arrow"})
+
+_NDJSON_BATCH = 500
+_ARROW_BATCH = 8192  # rows per Arrow record batch / Parquet row group
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _iso(ts: float | None) -> str | None:
+    return None if ts is None else datetime.fromtimestamp(ts, UTC).isoformat()
+
+
+def ndjson(rows: Iterable[dict]) -> Iterator[bytes]:
+    for batch in _batches(rows, _NDJSON_BATCH):
+        yield "".join(
+            json.dumps({**r, "finished_at": _iso(r["finished_at"])}) + "\n" for r in batch
+        ).encode()
+
+
+def columnar_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _schema() -> Any:
+    import pyarrow as pa
+
+    types = {
+        "finished_at": pa.timestamp("ms", tz="UTC"),
+        "port": pa.int32(),
+        "status": pa.int32(),
+        "bytes": pa.int64(),
+    }
+    return pa.schema([(c, types.get(c, pa.string())) for c in EXPORT_COLUMNS])
+
+
+class _ChunkSink:
+    """Write-only file object that holds what pyarrow wrote until the next drain()."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def columnar(rows: Iterable[dict], fmt: str) -> Iterator[bytes]:
+    """Parquet (one row group per batch, zstd) or Arrow IPC stream; needs pyarrow."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _schema()
+    sink = _ChunkSink()
+    out = pa.PythonFile(sink, mode="w")
+    parquet = fmt == "parquet"
+    writer = (
+        pq.ParquetWriter(out, schema, compression="zstd")
+        if parquet
+        else pa.ipc.new_stream(out, schema)
+    )
+
+    for batch in _batches(rows, _ARROW_BATCH):
+        for r in batch:
+            ts = r["finished_at"]
+            r["finished_at"] = None if ts is None else datetime.fromtimestamp(ts, UTC)
+        record_batch = pa.RecordBatch.from_pylist(batch, schema=schema)
+        if parquet:
+            writer.write_table(pa.Table.from_batches([record_batch]))
+        else:
+            writer.write_batch(record_batch)
+        if chunk := sink.drain():
+            yield chunk
+    writer.close()  # Parquet footer / end-of-stream marker
+    if chunk := sink.drain():
+        yield chunk
@@ -3,20 +3,43 @@ from __future__ import annotations
 
 import logging
 import uuid
+from datetime import UTC, datetime
+from typing import Annotated, Literal
 
-from fastapi import FastAPI, Header, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.adapters.system.celery_app import celery_app
+from app.adapters.api import export_formats
+from app.adapters.system import container
 from app.adapters.system.logging_cfg import configure_logger
-from app.adapters.system.redis_result_store import RedisResultStore
 from app.config import settings
+from app.domain.export_service import ExportQueryDTO, ExportService
+from app.ports.job_queue import JobQueuePort
+from app.ports.result_store import ResultStorePort
 
 LOG = logging.getLogger("adapter.api")
 app = FastAPI(title="favicon-scanner")
 configure_logger()
 
-_store = RedisResultStore(settings.REDIS_URL)
+
+# API role: only the result store and the enqueue port. Worker dependencies (Recog
+# parse, HTTP fetcher, ScanService) are never built in this process.
+def get_store() -> ResultStorePort:
+    return container.result_store()
+
+
+def get_queue() -> JobQueuePort:
+    return container.job_queue()
+
+
+def get_exporter() -> ExportService:
+    return container.export_service()
+
+
+StoreDep = Annotated[ResultStorePort, Depends(get_store)]
+QueueDep = Annotated[JobQueuePort, Depends(get_queue)]
+ExportDep = Annotated[ExportService, Depends(get_exporter)]
 
 
 class ScanRequestModel(BaseModel):
@@ -31,7 +54,10 @@ def health() -> dict:
 
 @app.post("/scan")
 async def scan_start(
-    payload: ScanRequestModel, x_api_key: str | None = Header(default=None)
+    payload: ScanRequestModel,
+    store: StoreDep,
+    queue: QueueDep,
+    x_api_key: str | None = Header(default=None),
 ) -> dict:
     if settings.API_KEY and x_api_key != settings.API_KEY:
         raise HTTPException(status_code=401, detail="invalid api key")
@@ -46,18 +72,69 @@ async def scan_start(
         raise HTTPException(status_code=400, detail="request too large (sockets cap)")
 
     scan_id = str(uuid.uuid4())
-    _store.set_pending(scan_id)
+    store.set_pending(scan_id)
 
-    job = celery_app.send_task("scan_job", args=[scan_id, payload.model_dump()], kwargs=None)
-    LOG.info("scan.enqueued", extra={"extra": {"scan_id": scan_id, "job_id": job.id}})
-    return {"scan_id": scan_id, "status": "pending", "job_id": job.id}
+    job_id = queue.enqueue("scan_job", args=[scan_id, payload.model_dump()])
+    LOG.info("scan.enqueued", extra={"extra": {"scan_id": scan_id, "job_id": job_id}})
+    return {"scan_id": scan_id, "status": "pending", "job_id": job_id}
 
 
 @app.get("/scan/{scan_id}")
-async def scan_result(scan_id: str, x_api_key: str | None = Header(default=None)) -> dict:
+async def scan_result(
+    scan_id: str,
+    store: StoreDep,
+    x_api_key: str | None = Header(default=None),
+) -> dict:
     if settings.API_KEY and x_api_key != settings.API_KEY:
         raise HTTPException(status_code=401, detail="invalid api key")
-    entry = _store.get(scan_id)
+    entry = store.get(scan_id)
     if entry is None:
         raise HTTPException(status_code=404, detail="scan_id not found")
     return entry
+
+
+def _epoch(dt: datetime | None) -> float | None:
+    if dt is None:
+        return None
+    return (dt if dt.tzinfo else dt.replace(tzinfo=UTC)).timestamp()  # naive means UTC
+
+
+_EXPORT_EXT = {"ndjson": "ndjson", "parquet": "parquet", "arrow": "arrows"}
+
+
+@app.get("/export")
+async def export_results(
+    exporter: ExportDep,
+    scan_id: Annotated[list[str] | None, Query()] = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    match: Annotated[list[str] | None, Query()] = None,
+    errors: bool = False,
+    fmt: Annotated[Literal["ndjson", "parquet", "arrow"], Query(alias="format")] = "ndjson",
+    x_api_key: str | None = Header(default=None),
+) -> StreamingResponse:
+    """
+    Stream flattened results (one row per result x match) across scans, selected by
+    scan_id (repeatable) and/or a finished_at range, optionally only for some match names.
+    """
+    if settings.API_KEY and x_api_key != settings.API_KEY:
+        raise HTTPException(status_code=401, detail="invalid api key")
+    if fmt in export_formats.COLUMNAR and not export_formats.columnar_available():
+        raise HTTPException(status_code=501, detail=f"{fmt} export needs pyarrow installed")
+
+    query = ExportQueryDTO(
+        scan_ids=scan_id or [],
+        since=_epoch(since),
+        until=_epoch(until),
+        match_names=match or [],
+        include_errors=errors,
+    )
+    rows = exporter.rows(query)
+    body = export_formats.ndjson(rows) if fmt == "ndjson" else export_formats.columnar(rows, fmt)
+    LOG.info("export.start", extra={"extra": {"format": fmt, "scans": len(query.scan_ids)}})
+    # a sync generator: Starlette pulls it from a worker thread, so store reads never block the loop
+    return StreamingResponse(
+        body,
+        media_type=export_formats.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="export.{_EXPORT_EXT[fmt]}"'},
+    )
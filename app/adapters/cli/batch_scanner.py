@@ -0,0 +1,423 @@
+# /app/adapters/cli/batch_scanner.py
+"""
+Standalone batch scanner: targets in, NDJSON out, no API/Celery/Redis in between.
+
+    python -m app.adapters.cli.batch_scanner -i targets.txt -o results.ndjson --state scan.state
+
+Each input line is a host, IP or CIDR (blank lines and ``#`` comments are skipped); its
+0-based line number is its *offset*. The main process streams lines in batches through
+a bounded queue to one worker process per core, each running its own event loop over
+ScanService, and writes every result as one JSON line as soon as it completes.
+
+``--state`` records the highest offset below which every line is finished (flushed
+after the output). Re-running with the same state file skips those lines; lines that
+were in flight at the time are scanned again, so resumed output is at-least-once.
+Lines finished above the watermark are remembered until it reaches them, so a huge
+CIDR line still in flight keeps one offset per later line finished meanwhile.
+
+``--shuffle`` reads all target lines up front and instead walks the whole host x port
+space in a seeded pseudorandom order (see CyclicPermutation), so load is spread across
+subnets and ports. Work items and offsets are then blocks of that walk; ``--shard k/n``
+takes every n-th position, for splitting one sweep across machines.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+from app.adapters.system.target_expander_impl import JobSpace, TargetExpander
+from app.config import settings
+from app.domain.permutation import CyclicPermutation
+
+LOG = logging.getLogger("adapter.cli.batch_scanner")
+
+_DONE = "done"  # out-queue message kinds
+_ROW = "row"
+_EXIT = "exit"
+_FAIL = "fail"
+
+_OUT_QUEUE_PER_PROC = 1024  # rows a worker may buffer before it waits for the writer
+
+
+# ==== work items: payload -> (host, port) pairs ====
+
+
+class _LineWork:
+    """Payload is one input line: its hosts (CIDRs expanded lazily) x ports, host-major."""
+
+    def __init__(self, ports: list[int]) -> None:
+        self.ports = ports
+
+    def __call__(self, line: str) -> Iterator[tuple[str, int]]:
+        for host in TargetExpander.iter_hosts([line]):
+            for port in self.ports:
+                yield host, port
+
+
+class _ShuffledWork:
+    """Payload is a block number k: positions [k*block, (k+1)*block) of this shard's walk."""
+
+    def __init__(
+        self, space: JobSpace, perm: CyclicPermutation, block: int, shard: int, shards: int
+    ) -> None:
+        self.space, self.perm = space, perm
+        self.block, self.shard, self.shards = block, shard, shards
+        positions = len(range(shard, perm.period, shards))
+        self.blocks = -(-positions // block)
+
+    def __call__(self, k: int) -> Iterator[tuple[str, int]]:
+        first = self.shard + self.shards * self.block * k
+        stop = first + self.shards * self.block
+        return self.space.pairs(self.perm.iter_range(first, stop, self.shards))
+
+
+# ==== worker process ====
+
+
+def _worker_main(in_q: Any, out_q: Any, work: Any, log_level: int) -> None:
+    error: str | None = None
+    try:
+        from app.adapters.system import container
+        from app.adapters.system.logging_cfg import configure_logger
+        from app.domain import scan_service  # noqa: F401  (configures stdout logging on import)
+
+        configure_logger(log_level, stream=sys.stderr)  # stdout may be the NDJSON stream
+        service = container.scan_service()
+        asyncio.run(_worker_loop(service, work, in_q, out_q))
+    except BaseException as e:
+        error = f"worker {os.getpid()}: {type(e).__name__}: {e}"
+        raise
+    finally:
+        out_q.put((_EXIT, error))
+
+
+async def _send(out_q: Any, msg: tuple[str, Any]) -> None:
+    try:
+        out_q.put_nowait(msg)
+    except queue.Full:
+        # the writer is behind: wait off the loop, so in-flight probe deadlines hold
+        await asyncio.to_thread(out_q.put, msg)
+
+
+async def _worker_loop(service: Any, work: Any, in_q: Any, out_q: Any) -> None:
+    sem = asyncio.Semaphore(settings.CONCURRENCY)
+    inflight: set[asyncio.Task] = set()
+    remaining: dict[int, int] = {}  # offset -> probes not finished yet (+1 while enumerating)
+
+    async def _finish(offset: int) -> None:
+        remaining[offset] -= 1
+        if remaining[offset] == 0:
+            del remaining[offset]
+            await _send(out_q, (_DONE, offset))  # after every row of the offset is queued
+
+    async def _probe(ctx: Any, offset: int, host: str, port: int) -> None:
+        try:
+            try:
+                row = (await service.probe(ctx, host, port)).as_dict()
+            except Exception as e:
+                row = service.error_for(host, port, e)
+            row["offset"] = offset
+            await _send(out_q, (_ROW, json.dumps(row, default=str)))
+            await _finish(offset)
+        finally:
+            sem.release()  # only once the row is queued: a full queue stops new probes
+
+    while (batch := await asyncio.to_thread(in_q.get)) is not None:
+        ctx = service.new_context()  # per batch: bounds the md5 memo, picks up reloads
+        for offset, payload in batch:
+            remaining[offset] = 1
+            for host, port in work(payload):
+                await sem.acquire()  # bounds in-flight probes, and so memory
+                remaining[offset] += 1
+                task = asyncio.create_task(_probe(ctx, offset, host, port))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
+            await _finish(offset)
+
+    if inflight:
+        await asyncio.wait(inflight)
+
+
+# ==== main process ====
+
+
+def _open_input(path: str) -> contextlib.AbstractContextManager[TextIO]:
+    return contextlib.nullcontext(sys.stdin) if path == "-" else open(path, encoding="utf-8")
+
+
+def _open_output(path: str, *, append: bool) -> contextlib.AbstractContextManager[TextIO]:
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    return open(path, "a" if append else "w", encoding="utf-8")
+
+
+def _line_items(lines: Iterable[str]) -> Iterator[tuple[int, str | None]]:
+    for offset, raw in enumerate(lines):
+        yield offset, raw.split("#", 1)[0].strip() or None
+
+
+def _dispatch(
+    items: Iterator[tuple[int, Any]], start: int, batch: int, procs: int, in_q: Any, out_q: Any
+) -> None:
+    buf: list[tuple[int, Any]] = []
+    try:
+        for offset, payload in items:
+            if offset < start:
+                continue
+            if payload is None:
+                out_q.put((_DONE, offset))  # nothing to scan, but keeps the watermark moving
+                continue
+            buf.append((offset, payload))
+            if len(buf) >= batch:
+                in_q.put(buf)  # blocks when workers fall behind
+                buf = []
+    except Exception as e:
+        out_q.put((_FAIL, f"reading input: {type(e).__name__}: {e}"))  # the run stops
+        return
+    if buf:
+        in_q.put(buf)
+    for _ in range(procs):
+        in_q.put(None)
+
+
+class _Checkpoint:
+    """
+    Low watermark over completed offsets, persisted atomically to the state file.
+    Offsets completed above the watermark wait in ``_done`` until the gap below them
+    closes: one line that takes long (a /8 CIDR) grows it by every line finished
+    meanwhile. Shuffle-mode blocks are all the same size, so there it stays small.
+    """
+
+    def __init__(self, path: str | None) -> None:
+        self._path = Path(path) if path else None
+        self._done: set[int] = set()
+        self.next_offset = 0
+        self.meta: dict[str, Any] = {}  # run parameters a resume must reuse (shuffle mode)
+        if self._path and self._path.exists():
+            self.meta = json.loads(self._path.read_text())
+            self.next_offset = int(self.meta.pop("next_offset"))
+
+    def complete(self, offset: int) -> None:
+        self._done.add(offset)
+        while self.next_offset in self._done:
+            self._done.remove(self.next_offset)
+            self.next_offset += 1
+
+    def save(self) -> None:
+        if self._path is None:
+            return
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"next_offset": self.next_offset, **self.meta}))
+        os.replace(tmp, self._path)
+
+
+def _sequential(
+    src: TextIO, ports: list[int], checkpoint: _Checkpoint
+) -> tuple[_LineWork, Iterator[tuple[int, str | None]]]:
+    if checkpoint.meta:
+        raise ValueError("state file was written by a --shuffle run; its offsets are blocks")
+    return _LineWork(ports), _line_items(src)
+
+
+def _shuffled(
+    src: TextIO,
+    ports: list[int],
+    checkpoint: _Checkpoint,
+    *,
+    seed: int | None,
+    shard: int,
+    shards: int,
+    block: int,
+) -> tuple[_ShuffledWork, Iterator[tuple[int, int]]]:
+    params: dict[str, Any] = {
+        "seed": seed, "shard": shard, "shards": shards, "block": block, "ports": ports,
+    }  # fmt: skip
+    if checkpoint.meta:
+        if seed is None:
+            params["seed"] = checkpoint.meta.get("seed")
+        if checkpoint.meta != params:
+            raise ValueError(f"state file belongs to a different run: {checkpoint.meta}")
+    elif seed is None:
+        params["seed"] = random.getrandbits(63)  # recorded in the state so resume can reuse it
+    checkpoint.meta = params
+
+    specs = [line for _, line in _line_items(src) if line]
+    space = JobSpace(specs, ports)
+    perm = CyclicPermutation(space.size, params["seed"])
+    work = _ShuffledWork(space, perm, block, shard, shards)
+    LOG.info(
+        "batch.shuffled",
+        extra={"extra": {"pairs": space.size, "blocks": work.blocks, "seed": params["seed"]}},
+    )
+    return work, ((k, k) for k in range(work.blocks))
+
+
+def _dead_worker(workers: list[Any]) -> str | None:
+    for w in workers:
+        if w.exitcode not in (None, 0):  # killed, or died before it could report
+            return f"worker {w.pid} exited with code {w.exitcode}"
+    return None
+
+
+def _abort(workers: list[Any], out: TextIO, checkpoint: _Checkpoint, reason: str) -> None:
+    """Keeps what is done, stops the rest."""
+    for w in workers:
+        w.terminate()
+    out.flush()
+    checkpoint.save()
+    raise RuntimeError(f"batch scan failed: {reason}")
+
+
+def _collect(out: TextIO, out_q: Any, workers: list[Any], checkpoint: _Checkpoint) -> int:
+    """Writes rows and advances the checkpoint until every worker has exited cleanly."""
+    rows, exited, last_save = 0, 0, time.monotonic()
+    while exited < len(workers):
+        try:
+            kind, payload = out_q.get(timeout=1.0)
+        except queue.Empty:
+            kind, payload = None, None
+        if kind == _ROW:
+            out.write(payload + "\n")
+            rows += 1
+        elif kind == _DONE:
+            checkpoint.complete(payload)
+        elif kind == _EXIT and payload is None:
+            exited += 1
+        elif payload is not None:
+            _abort(workers, out, checkpoint, payload)  # unreadable input, or a worker error
+        if time.monotonic() - last_save >= 1.0:
+            out.flush()  # rows first, so the state never covers unwritten results
+            checkpoint.save()
+            last_save = time.monotonic()
+            # checked here too, not only when the queue is quiet: the others may keep busy
+            if (dead := _dead_worker(workers)) is not None:
+                _abort(workers, out, checkpoint, dead)
+    return rows
+
+
+def run(
+    *,
+    input_path: str,
+    out: TextIO,
+    ports: list[int],
+    procs: int,
+    state: str | None = None,
+    batch: int = 64,
+    log_level: int = logging.WARNING,
+    shuffle: bool = False,
+    seed: int | None = None,
+    shard: int = 0,
+    shards: int = 1,
+    block: int = 4096,
+) -> int:
+    """Scan every target line; returns the number of rows written."""
+    checkpoint = _Checkpoint(state)
+    # opened here, not on the reader thread, so a bad path fails before anything starts
+    with _open_input(input_path) as src:
+        work: _LineWork | _ShuffledWork
+        items: Iterator[tuple[int, Any]]
+        if shuffle:
+            work, items = _shuffled(
+                src, ports, checkpoint, seed=seed, shard=shard, shards=shards, block=block
+            )
+            batch = 1  # a block is already a sizeable work item
+        else:
+            work, items = _sequential(src, ports, checkpoint)
+
+        in_q: Any = mp.Queue(maxsize=procs * 4)
+        out_q: Any = mp.Queue(maxsize=procs * _OUT_QUEUE_PER_PROC)
+
+        workers = [
+            mp.Process(target=_worker_main, args=(in_q, out_q, work, log_level), daemon=True)
+            for _ in range(procs)
+        ]
+        for w in workers:  # fork before any thread exists in this process
+            w.start()
+        reader = threading.Thread(
+            target=_dispatch,
+            args=(items, checkpoint.next_offset, batch, procs, in_q, out_q),
+            daemon=True,
+        )
+        reader.start()
+
+        rows = _collect(out, out_q, workers, checkpoint)
+        reader.join()
+
+    for w in workers:
+        w.join()
+    out.flush()
+    checkpoint.save()
+    LOG.info("batch.done", extra={"extra": {"rows": rows, "next_offset": checkpoint.next_offset}})
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Batch favicon scan with NDJSON output.")
+    ap.add_argument("-i", "--input", default="-", help="targets file, one per line (- = stdin)")
+    ap.add_argument("-o", "--output", default="-", help="NDJSON output file (- = stdout)")
+    ap.add_argument(
+        "-p",
+        "--ports",
+        default=",".join(map(str, settings.DEFAULT_PORTS)),
+        help="comma-separated ports",
+    )
+    ap.add_argument("-j", "--procs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--state", help="checkpoint file for resumable runs")
+    ap.add_argument("--batch", type=int, default=64, help="input lines per work item")
+    ap.add_argument("-v", "--verbose", action="store_true", help="per-probe INFO logs")
+    ap.add_argument(
+        "--shuffle", action="store_true", help="pseudorandom order over all host x port pairs"
+    )
+    ap.add_argument("--seed", type=int, help="--shuffle seed (default: random, kept in --state)")
+    ap.add_argument("--shard", default="0/1", help="--shuffle slice k/n of the walk")
+    ap.add_argument("--block", type=int, default=4096, help="--shuffle walk positions per item")
+    args = ap.parse_args(argv)
+
+    ports = [int(p) for p in args.ports.split(",") if p]
+    if not ports or any(p < 1 or p > 65535 for p in ports):
+        ap.error("invalid port list")
+    try:
+        shard, shards = (int(x) for x in args.shard.split("/"))
+    except ValueError:
+        ap.error("--shard must look like k/n")
+    if not 0 <= shard < shards:
+        ap.error("--shard k/n needs 0 <= k < n")
+    if shards > 1 and not args.shuffle:
+        ap.error("--shard needs --shuffle")
+
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    # a resumed run appends to what the previous run already wrote
+    append = bool(args.state) and Path(args.state).exists()
+    with _open_output(args.output, append=append) as out:
+        run(
+            input_path=args.input,
+            out=out,
+            ports=ports,
+            procs=args.procs,
+            state=args.state,
+            batch=args.batch,
+            log_level=log_level,
+            shuffle=args.shuffle,
+            seed=args.seed,
+            shard=shard,
+            shards=shards,
+            block=args.block,
+        )
+
+
+if __name__ == "__main__":
+    main()
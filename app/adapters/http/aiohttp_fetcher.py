@@ -6,6 +6,7 @@ import logging
 
 import aiohttp
 
+from app.adapters.http.tls import TLSClient
 from app.config import settings
 
 LOG = logging.getLogger("adapter.http_fetcher")
@@ -16,9 +17,11 @@ class AiohttpFetcher:
     Loop-aware aiohttp fetcher.
     Celery tasks use asyncio.run (new loop per task). We detect loop changes and
     rebuild the connector/session so we never hold a session tied to a closed loop.
+    TLS contexts and cached sessions live in ``self.tls`` and survive those rebuilds.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, tls: TLSClient | None = None) -> None:
+        self.tls = tls or TLSClient()
         self._connector: aiohttp.TCPConnector | None = None
         self._timeout = aiohttp.ClientTimeout(total=settings.TIMEOUT_SECONDS)
         self._session: aiohttp.ClientSession | None = None
@@ -72,7 +75,12 @@ class AiohttpFetcher:
                     LOG.info(
                         "fetching", extra={"extra": {"url": url, "verify_tls": settings.VERIFY_TLS}}
                     )
-                    async with sess.get(url, ssl=settings.VERIFY_TLS, allow_redirects=True) as resp:
+                    async with sess.get(
+                        url,
+                        ssl=self.tls.context(settings.VERIFY_TLS),
+                        allow_redirects=True,
+                        max_redirects=settings.MAX_REDIRECTS,
+                    ) as resp:
                         body = bytearray()
                         async for chunk in resp.content.iter_chunked(64 * 1024):
                             body.extend(chunk)
@@ -90,6 +98,9 @@ class AiohttpFetcher:
                     attempt += 1
 
     async def close(self) -> None:
+        if self.tls.handshakes:
+            LOG.info("tls.stats", extra={"extra": self.tls.stats()})
+        self.tls.close()
         if self._session and not self._session.closed:
             await self._session.close()
             self._session = None
@@ -0,0 +1,270 @@
+# /app/adapters/http/asyncio_fetcher.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import zlib
+from collections.abc import AsyncGenerator
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+
+from app.adapters.http.tls import TLSClient
+from app.config import settings
+
+LOG = logging.getLogger("adapter.http_fetcher.asyncio")
+
+_REDIRECTS = frozenset({301, 302, 303, 307, 308})
+_NO_BODY = frozenset({204, 304})
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_READ_CHUNK = 64 * 1024
+
+
+class HTTPProtocolError(Exception):
+    """Peer sent something this minimal HTTP/1.1 client cannot parse."""
+
+
+class TooManyRedirects(HTTPProtocolError):
+    pass
+
+
+def _host_header(host: str, port: int, scheme: str) -> str:
+    h = f"[{host}]" if ":" in host else host
+    return h if _DEFAULT_PORTS.get(scheme) == port else f"{h}:{port}"
+
+
+def _url(scheme: str, host: str, port: int, path: str) -> str:
+    return f"{scheme}://{_host_header(host, port, scheme)}{path}"
+
+
+class AsyncioFetcher:
+    """
+    HTTPFetcherPort on bare asyncio streams: one GET per connection (Connection: close),
+    no cookie jar, tracing or URL objects. Same limits, timeout, MAX_BYTES cap and retry
+    policy as AiohttpFetcher; redirects are followed up to MAX_REDIRECTS.
+    """
+
+    def __init__(self, tls: TLSClient | None = None) -> None:
+        self._max_bytes = settings.MAX_BYTES
+        self._retries = settings.RETRIES
+        self._backoff_ms = settings.RETRY_BACKOFF_MS
+        self._max_redirects = settings.MAX_REDIRECTS
+        self.tls = tls or TLSClient()
+        self._verify = settings.VERIFY_TLS
+        self._ssl = self.tls.context(self._verify)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._sem = asyncio.Semaphore(settings.CONCURRENCY)
+        # (host, port) -> [semaphore, users]; dropped when idle so sweeps do not grow it
+        self._per_host: dict[tuple[str, int], list] = {}
+
+    def _bind_loop(self) -> None:
+        # semaphores bind to the first loop that waits on them; Celery runs a new loop per task
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._sem = asyncio.Semaphore(settings.CONCURRENCY)
+            self._per_host = {}
+            self._loop = loop
+
+    async def fetch(self, scheme: str, host: str, port: int, path: str) -> tuple[int, bytes, str]:
+        """
+        Returns (status, body, final_url). Enforces global/per-host limits, timeout,
+        max bytes, and retries with exponential backoff.
+        """
+        self._bind_loop()
+        url = _url(scheme, host, port, path)
+        slot = self._per_host.setdefault(
+            (host, port), [asyncio.Semaphore(settings.PER_HOST_LIMIT), 0]
+        )
+        slot[1] += 1
+        try:
+            async with self._sem, slot[0]:
+                attempt = 0
+                while True:
+                    try:
+                        LOG.info(
+                            "fetching",
+                            extra={"extra": {"url": url, "verify_tls": settings.VERIFY_TLS}},
+                        )
+                        async with asyncio.timeout(settings.TIMEOUT_SECONDS):
+                            return await self._get_following_redirects(scheme, host, port, path)
+                    except (TimeoutError, OSError, HTTPProtocolError):
+                        if attempt >= self._retries:
+                            raise
+                        await asyncio.sleep((self._backoff_ms / 1000.0) * (2**attempt))
+                        attempt += 1
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                self._per_host.pop((host, port), None)
+
+    async def _get_following_redirects(
+        self, scheme: str, host: str, port: int, path: str
+    ) -> tuple[int, bytes, str]:
+        for _ in range(self._max_redirects + 1):
+            status, headers, body = await self._get(scheme, host, port, path)
+            url = _url(scheme, host, port, path)
+            location = headers.get("location")
+            if status not in _REDIRECTS or not location:
+                return status, body, url
+
+            nxt = urlsplit(urljoin(url, location))
+            if nxt.scheme not in _DEFAULT_PORTS or not nxt.hostname:
+                raise HTTPProtocolError(f"unsupported redirect target: {location!r}")
+            scheme, host = nxt.scheme, nxt.hostname
+            port = nxt.port or _DEFAULT_PORTS[scheme]
+            path = (nxt.path or "/") + (f"?{nxt.query}" if nxt.query else "")
+        raise TooManyRedirects(f"more than {self._max_redirects} redirects")
+
+    async def _get(
+        self, scheme: str, host: str, port: int, path: str
+    ) -> tuple[int, dict[str, str], bytes]:
+        reader, writer = await self._connect(scheme == "https", host, port)
+        try:
+            writer.write(
+                (
+                    f"GET {path} HTTP/1.1\r\n"
+                    f"Host: {_host_header(host, port, scheme)}\r\n"
+                    "User-Agent: favicon-scanner\r\n"
+                    "Accept: */*\r\n"
+                    "Accept-Encoding: gzip, deflate\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("latin-1")
+            )
+            await writer.drain()
+
+            status, headers = await self._read_head(reader)
+            while 100 <= status < 200:  # interim responses (100 Continue, 103 Early Hints)
+                status, headers = await self._read_head(reader)
+
+            if status in _NO_BODY:
+                return status, headers, b""
+            body = await self._read_body(reader, headers)
+            return status, headers, body
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass  # peer already gone or unclean TLS shutdown; the response is complete
+
+    async def _connect(self, tls: bool, host: str, port: int) -> tuple[asyncio.StreamReader, Any]:
+        if not tls:
+            return await asyncio.open_connection(host, port)
+        if self.tls.offload:
+            return await self.tls.open_connection(host, port, verify=self._verify)
+        return await asyncio.open_connection(host, port, ssl=self._ssl, server_hostname=host)
+
+    # --- minimal HTTP/1.1 response parser ---
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> tuple[int, dict[str, str]]:
+        try:
+            raw = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            raise HTTPProtocolError("truncated or oversized response head") from e
+
+        status_line, *lines = raw[:-4].decode("latin-1").split("\r\n")
+        parts = status_line.split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/1.") or not parts[1].isdigit():
+            raise HTTPProtocolError(f"bad status line: {status_line[:80]!r}")
+
+        headers: dict[str, str] = {}
+        for line in lines:
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPProtocolError(f"bad header line: {line[:80]!r}")
+            key = name.strip().lower()
+            value = value.strip()
+            headers[key] = f"{headers[key]}, {value}" if key in headers else value
+        return int(parts[1]), headers
+
+    def _body_chunks(
+        self, reader: asyncio.StreamReader, headers: dict[str, str]
+    ) -> AsyncGenerator[bytes, None]:
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            return self._iter_chunked(reader)
+        if "content-length" in headers:
+            try:
+                length = int(headers["content-length"])
+            except ValueError as e:
+                raise HTTPProtocolError("bad content-length") from e
+            return self._iter_length(reader, length)
+        return self._iter_until_eof(reader)
+
+    @staticmethod
+    def _decoder(encoding: str) -> zlib._Decompress | None:
+        if encoding in ("gzip", "x-gzip"):
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if encoding == "deflate":
+            return zlib.decompressobj()
+        return None
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict[str, str]) -> bytes:
+        chunks = self._body_chunks(reader, headers)
+        encoding = headers.get("content-encoding", "").strip().lower()
+        decoder = self._decoder(encoding)
+
+        body = bytearray()
+        try:
+            async for chunk in chunks:
+                if decoder is not None:
+                    # never inflate more than the cap allows (zip bombs)
+                    chunk = decoder.decompress(chunk, self._max_bytes + 1 - len(body))
+                body.extend(chunk)
+                if len(body) > self._max_bytes:
+                    LOG.warning("body_truncated", extra={"extra": {"max": self._max_bytes}})
+                    break
+            else:
+                if decoder is not None:
+                    body.extend(decoder.flush())
+        except zlib.error as e:
+            raise HTTPProtocolError(f"bad {encoding} body") from e
+        finally:
+            await chunks.aclose()
+        return bytes(body[: self._max_bytes])
+
+    @staticmethod
+    async def _iter_length(
+        reader: asyncio.StreamReader, length: int
+    ) -> AsyncGenerator[bytes, None]:
+        remaining = length
+        while remaining > 0:
+            chunk = await reader.read(min(remaining, _READ_CHUNK))
+            if not chunk:
+                raise HTTPProtocolError("connection closed before content-length bytes")
+            remaining -= len(chunk)
+            yield chunk
+
+    @staticmethod
+    async def _iter_until_eof(reader: asyncio.StreamReader) -> AsyncGenerator[bytes, None]:
+        while chunk := await reader.read(_READ_CHUNK):
+            yield chunk
+
+    @staticmethod
+    async def _iter_chunked(reader: asyncio.StreamReader) -> AsyncGenerator[bytes, None]:
+        try:
+            while True:
+                size_line = await reader.readuntil(b"\r\n")
+                size_hex = size_line.split(b";", 1)[0].strip()
+                try:
+                    size = int(size_hex, 16)
+                except ValueError as e:
+                    raise HTTPProtocolError(f"bad chunk size: {size_hex[:16]!r}") from e
+                if size == 0:
+                    return  # trailers are ignored; the connection is closed anyway
+                remaining = size
+                while remaining > 0:
+                    chunk = await reader.read(min(remaining, _READ_CHUNK))
+                    if not chunk:
+                        raise HTTPProtocolError("connection closed inside a chunk")
+                    remaining -= len(chunk)
+                    yield chunk
+                await reader.readexactly(2)  # CRLF after chunk data
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            raise HTTPProtocolError("truncated chunked body") from e
+
+    async def close(self) -> None:
+        """Nothing pooled: every request owns and closes its connection."""
+        if self.tls.handshakes:
+            LOG.info("tls.stats", extra={"extra": self.tls.stats()})
+        self.tls.close()
@@ -0,0 +1,137 @@
+# /app/adapters/http/fetch_archive.py
+"""
+Append-only archive of fetch outcomes, shared by RecordingFetcher and ReplayFetcher.
+
+    file   := MAGIC record*
+    record := u32 meta_len | u32 body_len | zlib(meta JSON) | zlib(body)
+
+``meta`` is ``{"k": [scheme, host, port, path], "t": unix time}`` plus either
+``"s"`` (status), ``"u"`` (final_url) and ``"h"`` (sha256 of the body, or null), or
+``"e": [exception type, detail]`` for a failed fetch. Bodies are content-addressed:
+a body is written with the first record that references its sha256 and
+``body_len`` is 0 for every later one, so a sweep stores each favicon once.
+
+Records are length-prefixed, so the index (key -> record) is rebuilt with one
+sequential pass on open. A record is written with a single ``write()``; only a crash
+mid-write leaves a truncated tail, which readers ignore and writers cut off. A complete
+record that does not decode is damage, not a crash: readers and writers raise rather
+than drop it and everything after it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+LOG = logging.getLogger("adapter.fetch_archive")
+
+MAGIC = b"FAVARC1\n"
+_HEAD = struct.Struct("<II")
+
+FetchKey = tuple[str, str, int, str]  # (scheme, host, port, path)
+
+
+def iter_records(f: BinaryIO, *, bodies: bool = True) -> Iterator[tuple[int, dict, bytes | None]]:
+    """
+    (end offset, meta, body) per complete record after MAGIC. Stops at a truncated tail;
+    raises ValueError at a complete record that does not decode.
+    """
+    size = os.fstat(f.fileno()).st_size
+    while True:
+        start = f.tell()
+        head = f.read(_HEAD.size)
+        if len(head) < _HEAD.size:
+            return
+        meta_len, body_len = _HEAD.unpack(head)
+        end = f.tell() + meta_len + body_len
+        if end > size:
+            return
+        try:
+            meta = json.loads(zlib.decompress(f.read(meta_len)))
+            body = zlib.decompress(f.read(body_len)) if bodies and body_len else None
+        except (zlib.error, ValueError) as e:
+            raise ValueError(f"corrupt fetch archive record at offset {start}: {e}") from e
+        f.seek(end)
+        yield end, meta, body
+
+
+def open_archive(path: str | Path) -> BinaryIO:
+    f = open(path, "rb")
+    if f.read(len(MAGIC)) != MAGIC:
+        f.close()
+        raise ValueError(f"not a fetch archive: {path}")
+    return f
+
+
+class FetchArchiveWriter:
+    """
+    Appends records; reopening an existing archive continues it (and its body dedupe).
+    ``append`` may be called from several threads; records are written one at a time.
+    """
+
+    def __init__(self, path: str | Path, *, level: int = 6) -> None:
+        self.path = Path(path)
+        self._level = level
+        self._stored: set[str] = set()  # sha256 of bodies already in the file
+        self._lock = threading.Lock()  # a body must land before records that refer to it
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            good = len(MAGIC)
+            with open_archive(self.path) as f:
+                for end, meta, _ in iter_records(f, bodies=False):  # raises if damaged
+                    good = end
+                    if meta.get("h"):
+                        self._stored.add(meta["h"])
+            if self.path.stat().st_size > good:
+                LOG.warning(
+                    "fetch_archive.truncated_tail",
+                    extra={"extra": {"path": str(self.path), "kept_bytes": good}},
+                )
+                with open(self.path, "r+b") as f:
+                    f.truncate(good)
+            self._f = open(self.path, "ab", buffering=0)
+        else:
+            self._f = open(self.path, "wb", buffering=0)
+            self._f.write(MAGIC)
+
+    def append(
+        self,
+        key: FetchKey,
+        *,
+        status: int | None = None,
+        body: bytes | None = None,
+        final_url: str | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        meta: dict[str, Any] = {"k": list(key), "t": round(time.time(), 3)}
+        sha256 = None
+        if error is not None:
+            meta["e"] = [type(error).__name__, str(error)]
+        else:
+            sha256 = hashlib.sha256(body).hexdigest() if body else None
+            meta.update(s=status, u=final_url, h=sha256)
+        packed_meta = zlib.compress(json.dumps(meta, separators=(",", ":")).encode(), self._level)
+
+        with self._lock:
+            packed_body = b""
+            if sha256 is not None and sha256 not in self._stored:
+                packed_body = zlib.compress(body or b"", self._level)
+                self._stored.add(sha256)
+            # one write per record, so a crash can only truncate the last one
+            self._f.write(
+                _HEAD.pack(len(packed_meta), len(packed_body)) + packed_meta + packed_body
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._f.close()
@@ -0,0 +1,47 @@
+# /app/adapters/http/recording_fetcher.py
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from app.adapters.http.fetch_archive import FetchArchiveWriter
+from app.ports.http_fetcher import HTTPFetcherPort
+
+LOG = logging.getLogger("adapter.http_fetcher.recording")
+
+
+class RecordingFetcher:
+    """
+    HTTPFetcherPort decorator: delegates every fetch and appends its outcome (response
+    or exception) to a fetch archive, for network-free reruns with ReplayFetcher.
+
+    Outcomes are recorded after the inner fetcher's own retries. A fetch cancelled from
+    outside (ScanService's timeout) is not recorded, so it replays as a miss. Appends
+    (compression and the file write) run in a worker thread, off the event loop.
+    """
+
+    def __init__(self, inner: HTTPFetcherPort, path: str | Path) -> None:
+        self.inner = inner
+        self.archive = FetchArchiveWriter(path)
+        LOG.info("recording fetches", extra={"extra": {"path": str(self.archive.path)}})
+
+    async def fetch(self, scheme: str, host: str, port: int, path: str) -> tuple[int, bytes, str]:
+        key = (scheme, host, port, path)
+        try:
+            status, body, final_url = await self.inner.fetch(scheme, host, port, path)
+        except Exception as e:
+            await asyncio.to_thread(self.archive.append, key, error=e)
+            raise
+        await asyncio.to_thread(
+            self.archive.append, key, status=status, body=body, final_url=final_url
+        )
+        return status, body, final_url
+
+    async def close(self) -> None:
+        try:
+            close = getattr(self.inner, "close", None)
+            if close is not None:
+                await close()
+        finally:
+            self.archive.close()
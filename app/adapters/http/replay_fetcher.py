@@ -0,0 +1,73 @@
+# /app/adapters/http/replay_fetcher.py
+from __future__ import annotations
+
+import logging
+from functools import cache
+from pathlib import Path
+
+from app.adapters.http.fetch_archive import FetchKey, iter_records, open_archive
+
+LOG = logging.getLogger("adapter.http_fetcher.replay")
+
+
+class ReplayMiss(LookupError):
+    """The archive has no outcome for this (scheme, host, port, path)."""
+
+
+class ReplayedFetchError(Exception):
+    """Base of the exceptions re-raised for recorded fetch failures."""
+
+
+@cache
+def _replayed_error(name: str) -> type[ReplayedFetchError]:
+    # same class name as the recorded exception, so error rows replay unchanged
+    return type(name, (ReplayedFetchError,), {})
+
+
+class ReplayFetcher:
+    """
+    HTTPFetcherPort served from a fetch archive, entirely from memory: no sockets,
+    no timing noise. The archive is loaded once; bodies are shared per sha256, so
+    memory is bounded by the distinct favicons rather than the number of probes.
+    When a key was recorded more than once, the last outcome wins.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        bodies: dict[str, bytes] = {}
+        self._outcomes: dict[FetchKey, tuple[int, bytes, str] | tuple[str, str]] = {}
+        with open_archive(path) as f:
+            for _, meta, body in iter_records(f):
+                sha256 = meta.get("h")
+                if body is not None and sha256:
+                    bodies[sha256] = body
+                scheme, host, port, fpath = meta["k"]
+                key = (scheme, host, int(port), fpath)
+                if "e" in meta:
+                    self._outcomes[key] = (meta["e"][0], meta["e"][1])
+                else:
+                    self._outcomes[key] = (meta["s"], bodies[sha256] if sha256 else b"", meta["u"])
+        LOG.info(
+            "replay archive loaded",
+            extra={
+                "extra": {"path": str(path), "keys": len(self._outcomes), "bodies": len(bodies)}
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self._outcomes)
+
+    def keys(self) -> list[FetchKey]:
+        return list(self._outcomes)
+
+    async def fetch(self, scheme: str, host: str, port: int, path: str) -> tuple[int, bytes, str]:
+        try:
+            outcome = self._outcomes[(scheme, host, port, path)]
+        except KeyError:
+            raise ReplayMiss(f"{scheme}://{host}:{port}{path} not in archive") from None
+        if len(outcome) == 2:
+            name, detail = outcome
+            raise _replayed_error(name)(detail)
+        return outcome
+
+    async def close(self) -> None:
+        """Nothing to release; the archive is closed after loading."""
@@ -0,0 +1,276 @@
+# /app/adapters/http/tls.py
+"""
+Client-side TLS shared by the HTTP fetchers.
+
+``TLSClient`` builds one SSLContext per verification mode, once per fetcher, instead
+of one per request or per aiohttp session. Each context keeps a bounded LRU of TLS
+sessions per server hostname. A host seen again (another port, an http->https
+redirect, a retry, the next job) resumes with an abbreviated handshake. The session is
+injected in ``SSLContext.wrap_bio``, which asyncio calls for every client TLS
+connection, so resumption works the same under aiohttp and bare asyncio streams.
+
+With ``handshake_threads > 0``, ``open_connection`` runs the handshake itself in a
+thread pool. OpenSSL releases the GIL for the key exchange and certificate checks, so
+HTTPS-heavy sweeps can spread handshakes over more than one core per process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from app.config import settings
+
+LOG = logging.getLogger("adapter.http_fetcher.tls")
+
+_READ_CHUNK = 64 * 1024
+_REPORT_EVERY = 1000  # handshakes between "tls.stats" log lines
+
+
+class TLSSessionCache:
+    """LRU of the latest resumable session per server hostname; 0 disables it."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._sessions: OrderedDict[str, ssl.SSLSession] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, host: str) -> ssl.SSLSession | None:
+        session = self._sessions.get(host)
+        if session is not None:
+            self._sessions.move_to_end(host)
+        return session
+
+    def put(self, host: str, session: ssl.SSLSession) -> None:
+        if self.maxsize <= 0:
+            return
+        self._sessions[host] = session
+        self._sessions.move_to_end(host)
+        if len(self._sessions) > self.maxsize:
+            self._sessions.popitem(last=False)
+
+
+class _TrackedSSLObject(ssl.SSLObject):
+    """Counts handshakes and hands the session back to the cache once it is resumable."""
+
+    _saved = False
+
+    def do_handshake(self) -> None:
+        super().do_handshake()  # raises SSLWantReadError until the handshake is done
+        self.context.tls_client._handshake_done(self)  # type: ignore[attr-defined]
+
+    def read(self, len: int = 1024, buffer: Any = None) -> Any:  # noqa: A002
+        data = super().read(len, buffer)
+        if not self._saved:
+            # TLS 1.3 tickets arrive after the handshake, with the first application data
+            session = self.session
+            if session is not None and (session.has_ticket or self.version() != "TLSv1.3"):
+                self.context.sessions.put(self.server_hostname, session)  # type: ignore[attr-defined]
+                self._saved = True
+        return data
+
+
+class _ResumingContext(ssl.SSLContext):
+    sslobject_class = _TrackedSSLObject
+    sessions: TLSSessionCache
+    tls_client: TLSClient
+
+    def wrap_bio(  # type: ignore[override]
+        self,
+        incoming: ssl.MemoryBIO,
+        outgoing: ssl.MemoryBIO,
+        server_side: bool = False,
+        server_hostname: str | None = None,
+        session: ssl.SSLSession | None = None,
+    ) -> ssl.SSLObject:
+        if session is None and server_hostname and not server_side:
+            session = self.sessions.get(server_hostname)
+        return super().wrap_bio(incoming, outgoing, server_side, server_hostname, session)
+
+
+class TLSClient:
+    """Pre-built contexts, per-host session resumption and handshake counters."""
+
+    def __init__(
+        self, *, cache_size: int | None = None, handshake_threads: int | None = None
+    ) -> None:
+        self._cache_size = settings.TLS_SESSION_CACHE if cache_size is None else cache_size
+        self._threads = (
+            settings.TLS_HANDSHAKE_THREADS if handshake_threads is None else handshake_threads
+        )
+        self._executor: ThreadPoolExecutor | None = None  # started on first use, and after close()
+        self._contexts: dict[bool, _ResumingContext] = {}
+        self._lock = threading.Lock()  # handshakes may finish on executor threads
+        self.handshakes = 0
+        self.resumed = 0
+
+    @property
+    def offload(self) -> bool:
+        return self._threads > 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._threads, thread_name_prefix="tls-handshake")
+        return self._executor
+
+    def context(self, verify: bool) -> ssl.SSLContext:
+        ctx = self._contexts.get(verify)
+        if ctx is None:
+            ctx = _ResumingContext(ssl.PROTOCOL_TLS_CLIENT)
+            if verify:
+                ctx.load_default_certs()
+            else:
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+            ctx.sessions = TLSSessionCache(self._cache_size)
+            ctx.tls_client = self
+            self._contexts[verify] = ctx
+        return ctx
+
+    def _handshake_done(self, sslobj: ssl.SSLObject) -> None:
+        with self._lock:
+            self.handshakes += 1
+            self.resumed += sslobj.session_reused
+            report = self.handshakes % _REPORT_EVERY == 0
+        if report:
+            LOG.info("tls.stats", extra={"extra": self.stats()})
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "handshakes": self.handshakes,
+            "resumed": self.resumed,
+            "resumption_rate": round(self.resumed / self.handshakes, 3) if self.handshakes else 0.0,
+            "cached_sessions": sum(len(c.sessions) for c in self._contexts.values()),
+        }
+
+    async def open_connection(
+        self, host: str, port: int, *, verify: bool
+    ) -> tuple[asyncio.StreamReader, _BIOConnection]:
+        """Like asyncio.open_connection(ssl=...), with the handshake run in the thread pool."""
+        if not self.offload:
+            raise RuntimeError("TLSClient was built without handshake threads")
+        raw_reader, raw_writer = await asyncio.open_connection(host, port)
+        conn = _BIOConnection(raw_reader, raw_writer, self.context(verify), host)
+        try:
+            await conn.handshake(self._pool)
+        except BaseException:
+            conn.close()
+            raise
+        return conn.reader, conn
+
+    def close(self) -> None:
+        """Stops the handshake threads. Contexts and cached sessions stay for later fetches."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class _Flow:
+    """Transport stand-in for the plaintext StreamReader: its flow control pauses the pump."""
+
+    def __init__(self) -> None:
+        self.resumed = asyncio.Event()
+        self.resumed.set()
+
+    def pause_reading(self) -> None:
+        self.resumed.clear()
+
+    def resume_reading(self) -> None:
+        self.resumed.set()
+
+
+class _BIOConnection:
+    """
+    TLS over MemoryBIOs on a plain asyncio connection, so ``do_handshake`` can run in a
+    thread. Afterwards a pump task decrypts into ``reader``; this object is the writer.
+    """
+
+    def __init__(
+        self,
+        raw_reader: asyncio.StreamReader,
+        raw_writer: asyncio.StreamWriter,
+        ctx: ssl.SSLContext,
+        host: str,
+    ) -> None:
+        self._raw_reader, self._raw_writer = raw_reader, raw_writer
+        self._incoming, self._outgoing = ssl.MemoryBIO(), ssl.MemoryBIO()
+        self._sslobj = ctx.wrap_bio(self._incoming, self._outgoing, server_hostname=host)
+        self._flow = _Flow()
+        self.reader = asyncio.StreamReader()
+        self.reader.set_transport(self._flow)  # type: ignore[arg-type]
+        self._pump: asyncio.Task | None = None
+
+    def _flush(self) -> None:
+        if data := self._outgoing.read():
+            self._raw_writer.write(data)
+
+    async def _fill(self) -> None:
+        await self._raw_writer.drain()
+        data = await self._raw_reader.read(_READ_CHUNK)
+        if data:
+            self._incoming.write(data)
+        else:
+            self._incoming.write_eof()  # the next SSLObject call reports the EOF
+
+    async def handshake(self, pool: Callable[[], ThreadPoolExecutor]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # looked up per step, so a close() mid-handshake cannot strand it
+                await loop.run_in_executor(pool(), self._sslobj.do_handshake)
+                break
+            except ssl.SSLWantReadError:
+                self._flush()
+                await self._fill()
+        self._flush()
+        self._pump = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                await self._flow.resumed.wait()
+                try:
+                    data = self._sslobj.read(_READ_CHUNK)
+                except ssl.SSLWantReadError:
+                    self._flush()  # post-handshake messages (key updates) may need a reply
+                    await self._fill()
+                    continue
+                if not data:
+                    break  # close_notify
+                self.reader.feed_data(data)
+        except (ssl.SSLEOFError, ssl.SSLZeroReturnError):
+            pass  # EOF without close_notify: same as a plain close for Connection: close
+        except Exception as e:
+            self.reader.set_exception(e)
+            return
+        self.reader.feed_eof()
+
+    # --- StreamWriter subset used by the fetcher ---
+
+    def write(self, data: bytes) -> None:
+        self._sslobj.write(data)
+        self._flush()
+
+    async def drain(self) -> None:
+        await self._raw_writer.drain()
+
+    def get_extra_info(self, name: str, default: Any = None) -> Any:
+        if name == "ssl_object":
+            return self._sslobj
+        return self._raw_writer.get_extra_info(name, default)
+
+    def close(self) -> None:
+        if self._pump is not None:
+            self._pump.cancel()
+        self._raw_writer.close()
+
+    async def wait_closed(self) -> None:
+        await self._raw_writer.wait_closed()
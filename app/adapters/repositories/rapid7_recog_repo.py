@@ -1,8 +1,11 @@
 # /app/adapters/repositories/rapid7_recog_repo.py
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -13,54 +16,160 @@ LOG = logging.getLogger("adapter.repo.recog")
 _HEX32 = re.compile(r"[0-9a-fA-F]{32}")
 
 
+@dataclass(frozen=True, slots=True)
+class RecogIndex:
+    """Immutable md5 -> fingerprints map for one version of the XML file."""
+
+    version: str  # sha256 prefix of the XML bytes; identical files give identical versions
+    by_md5: dict[str, list[dict[str, Any]]]
+
+    def lookup_md5(self, md5: str) -> list[dict]:
+        return self.by_md5.get(md5.lower(), [])
+
+
+def parse_recog_xml(raw: bytes) -> RecogIndex:
+    doc = xmltodict.parse(raw.decode("utf-8"))
+
+    fps = (doc.get("fingerprints") or {}).get("fingerprint", [])
+    if isinstance(fps, dict):
+        fps = [fps]
+
+    by_md5: dict[str, list[dict[str, Any]]] = {}
+    added = 0
+    for fp in fps:
+        pattern = fp.get("@pattern") or ""
+        # Extract all 32-hex tokens from the regex like ^(?:aa|bb|cc)$
+        md5s = _HEX32.findall(pattern)
+        if not md5s:
+            continue
+
+        name = fp.get("description") or "unknown"
+        params = fp.get("param") or []
+        if isinstance(params, dict):
+            params = [params]
+
+        props: dict[str, str] = {}
+        for p in params:
+            k = p.get("@name")
+            v = p.get("@value")
+            if k and v is not None:
+                props[k] = v
+
+        entry = {"name": name, "properties": props}
+
+        for m in md5s:
+            by_md5.setdefault(m.lower(), []).append(entry)
+            added += 1
+
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    LOG.info(
+        "recog favicon fingerprints loaded",
+        extra={"extra": {"md5_variants": added, "version": version}},
+    )
+    return RecogIndex(version=version, by_md5=by_md5)
+
+
+def diff_md5s(old: RecogIndex, new: RecogIndex) -> set[str]:
+    """MD5s whose fingerprints were added, changed or removed between two versions."""
+    changed = {m for m, fps in new.by_md5.items() if old.by_md5.get(m) != fps}
+    changed.update(m for m in old.by_md5 if m not in new.by_md5)
+    return changed
+
+
+class FixedIndexRepository:
+    """FingerprintRepositoryPort over one already-parsed index that never changes."""
+
+    def __init__(self, index: RecogIndex) -> None:
+        self._index = index
+
+    @property
+    def version(self) -> str:
+        return self._index.version
+
+    def snapshot(self) -> RecogIndex:
+        return self._index
+
+    def lookup_md5(self, md5: str) -> list[dict]:
+        return self._index.lookup_md5(md5)
+
+
 class Rapid7RecogRepository:
     """
     Parses Rapid7 recog http_favicon.xml.
     Builds a map: md5 (lowercase hex) -> list[ {name, properties} ].
+
+    The map lives in an immutable RecogIndex that reload() rebuilds on the side and
+    swaps in with a single attribute assignment, so lookups never see a partial index.
     """
 
     def __init__(self, path: str) -> None:
         self._path = Path(path)
-        self._by_md5: dict[str, list[dict[str, Any]]] = {}
-        self._load()
+        self._reload_lock = threading.Lock()
+        self._stat: tuple[int, int] | None = None
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._index = self._build()
+
+    def _file_stat(self) -> tuple[int, int]:
+        st = self._path.stat()
+        return st.st_mtime_ns, st.st_size
 
-    def _load(self) -> None:
+    def _build(self) -> RecogIndex:
         if not self._path.exists():
             raise FileNotFoundError(f"recog XML not found: {self._path}")
 
-        doc = xmltodict.parse(self._path.read_text(encoding="utf-8"))
-
-        fps = (doc.get("fingerprints") or {}).get("fingerprint", [])
-        if isinstance(fps, dict):
-            fps = [fps]
-
-        added = 0
-        for fp in fps:
-            pattern = fp.get("@pattern") or ""
-            # Extract all 32-hex tokens from the regex like ^(?:aa|bb|cc)$
-            md5s = _HEX32.findall(pattern)
-            if not md5s:
-                continue
-
-            name = fp.get("description") or "unknown"
-            params = fp.get("param") or []
-            if isinstance(params, dict):
-                params = [params]
-
-            props: dict[str, str] = {}
-            for p in params:
-                k = p.get("@name")
-                v = p.get("@value")
-                if k and v is not None:
-                    props[k] = v
-
-            entry = {"name": name, "properties": props}
+        # recorded before parsing: a broken file is retried only once it changes again
+        self._stat = self._file_stat()
+        return parse_recog_xml(self._path.read_bytes())
 
-            for m in md5s:
-                self._by_md5.setdefault(m.lower(), []).append(entry)
-                added += 1
+    @property
+    def version(self) -> str:
+        return self._index.version
 
-        LOG.info("recog favicon fingerprints loaded", extra={"extra": {"md5_variants": added}})
+    def snapshot(self) -> RecogIndex:
+        return self._index
 
     def lookup_md5(self, md5: str) -> list[dict]:
-        return self._by_md5.get(md5.lower(), [])
+        return self._index.lookup_md5(md5)
+
+    # --- reload ---
+
+    def reload(self) -> bool:
+        """Re-parse the XML and swap it in. Returns True if the version changed."""
+        with self._reload_lock:
+            fresh = self._build()
+            if fresh.version == self._index.version:
+                return False
+            old, self._index = self._index.version, fresh
+        LOG.info("recog reloaded", extra={"extra": {"from": old, "to": fresh.version}})
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """Cheap stat() check; only re-parses when mtime or size moved."""
+        try:
+            if self._file_stat() == self._stat:
+                return False
+            return self.reload()
+        except Exception:
+            # half-written or broken file: keep serving the current index until it changes
+            LOG.exception("recog reload failed", extra={"extra": {"path": str(self._path)}})
+            return False
+
+    def start_watching(self, interval: float) -> None:
+        """Poll FAVICONS_PATH from a daemon thread, off the scan hot path."""
+        if self._watcher is not None:
+            return
+
+        def _loop() -> None:
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=_loop, name="recog-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
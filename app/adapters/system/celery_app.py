@@ -7,14 +7,12 @@ import logging
 from typing import Any
 
 from celery import Celery
+from celery.signals import worker_process_init
 
-from app.adapters.http.aiohttp_fetcher import AiohttpFetcher
-from app.adapters.repositories.rapid7_recog_repo import Rapid7RecogRepository
+from app.adapters.system import container
 from app.adapters.system.logging_cfg import configure_logger
-from app.adapters.system.redis_result_store import RedisResultStore
-from app.adapters.system.target_expander_impl import TargetExpander
 from app.config import settings
-from app.domain.scan_service import ScanRequestDTO, ScanService
+from app.domain.scan_service import ScanRequestDTO
 
 LOG = logging.getLogger("adapter.celery")
 configure_logger()
@@ -29,19 +27,15 @@ celery_app.conf.update(
     task_time_limit=300,
 )
 
-# Singleton-ish wiring per worker process
+# Worker wiring is resolved through the container: importing this module (as the API
+# does, via CeleryJobQueue) must not parse the Recog DB or open any connections.
 
-_repo = Rapid7RecogRepository(settings.FAVICONS_PATH)
-_fetcher = AiohttpFetcher()
-_expander = TargetExpander()
-_store = RedisResultStore(settings.REDIS_URL)
-_service = ScanService(
-    repo=_repo,
-    fetcher=_fetcher,
-    expander=_expander,
-    default_ports=settings.DEFAULT_PORTS,
-    max_targets=settings.MAX_TARGETS,
-)
+
+@worker_process_init.connect
+def _warm_worker(**_: Any) -> None:
+    """Build the scanner in each pool process up front so the first job is not slow."""
+    container.scan_service()
+    container.result_store()
 
 
 @celery_app.task(
@@ -53,35 +47,48 @@ _service = ScanService(
 )
 def scan_job(self, scan_id: str, payload: dict[str, Any]) -> str:
     """Celery task: executes the scan and persists the result or error."""
+    store = container.result_store()
     try:
         LOG.info("scan.job.accepted", extra={"extra": {"scan_id": scan_id}})
+        service = container.scan_service()
         dto = ScanRequestDTO(
             targets=payload["targets"], ports=payload.get("ports") or settings.DEFAULT_PORTS
         )
 
         async def _run() -> dict:
-            resp = await _service.scan(dto)
+            resp = await service.scan(dto)
             return {
-                "results": [
-                    {
-                        "target": r.target,
-                        "scheme": r.scheme,
-                        "bytes": r.byte_len,
-                        "md5": r.md5,
-                        "status": r.status,
-                        "final_url": r.final_url,
-                        "matches": r.matches,
-                    }
-                    for r in resp.results
-                ],
+                "results": [r.as_dict() for r in resp.results],
                 "errors": resp.errors,
             }
 
         result_dict = asyncio.run(_run())
-        _store.set_result(scan_id, result_dict)
+        store.set_result(scan_id, result_dict)
         LOG.info("scan.job.done", extra={"extra": {"scan_id": scan_id}})
         return "ok"
     except Exception as e:
-        _store.set_error(scan_id, str(e))
+        store.set_error(scan_id, str(e))
         LOG.exception("scan.job.error", extra={"extra": {"scan_id": scan_id}})
         raise
+
+
+@celery_app.task(
+    name="rematch_job",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_kwargs={"max_retries": 10},
+)
+def rematch_job(self, md5s: list[str], old_version: str | None = None) -> dict:
+    """Celery task: re-match stored results for changed md5s against the loaded DB."""
+    service = container.rematch_service()
+    reload_if_changed = getattr(service.repo, "reload_if_changed", None)
+    if reload_if_changed is not None:
+        reload_if_changed()  # check now rather than wait for the watcher (which may be off)
+    loaded = service.repo.snapshot().version
+    if old_version and loaded == old_version:
+        # FAVICONS_PATH on this worker has not been updated yet; retry with backoff.
+        # Any other version (the new file, or one newer still) is applied as loaded.
+        raise RuntimeError(f"fingerprint DB is still {loaded}, waiting for the update")
+    report = service.rematch(md5s)
+    return {"db_version": report.db_version, "scans": report.scans, "results": report.results}
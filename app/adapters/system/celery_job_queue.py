@@ -0,0 +1,27 @@
+# /app/adapters/system/celery_job_queue.py
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+from app.adapters.system.celery_app import celery_app
+
+LOG = logging.getLogger("adapter.job_queue.celery")
+
+
+class CeleryJobQueue:
+    """JobQueuePort over Celery's ``send_task`` (by name, so no task code is imported)."""
+
+    def enqueue(
+        self,
+        task_name: str,
+        *,
+        args: list[Any] | None = None,
+        kwargs: Mapping[str, Any] | None = None,
+    ) -> str:
+        job = celery_app.send_task(
+            task_name, args=args or [], kwargs=dict(kwargs) if kwargs else None
+        )
+        LOG.info("queue.enqueued", extra={"extra": {"task": task_name, "job_id": job.id}})
+        return str(job.id)
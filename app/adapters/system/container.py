@@ -0,0 +1,157 @@
+# /app/adapters/system/container.py
+"""
+Composition root. Every adapter is built lazily, on first use, and cached per process.
+
+The API role only needs ``result_store()`` and ``job_queue()``; the worker role
+additionally pulls ``scan_service()``, which is the only provider that parses the
+Recog XML and creates the HTTP fetcher. Adapter modules are imported inside the
+providers so that importing this module stays cheap for either role.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import cache
+from typing import TYPE_CHECKING
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.domain.export_service import ExportService
+    from app.domain.rematch_service import RematchService
+    from app.domain.scan_service import ScanService
+    from app.ports.blob_store import BlobStorePort
+    from app.ports.fingerprint_repository import FingerprintRepositoryPort
+    from app.ports.http_fetcher import HTTPFetcherPort
+    from app.ports.job_queue import JobQueuePort
+    from app.ports.result_store import ResultStorePort
+    from app.ports.target_expander import TargetExpanderPort
+
+
+# ==== shared (API + worker) ====
+
+
+@cache
+def result_store() -> ResultStorePort:
+    from app.adapters.system.redis_result_store import RedisResultStore
+
+    return RedisResultStore(settings.REDIS_URL)
+
+
+# ==== API role ====
+
+
+@cache
+def job_queue() -> JobQueuePort:
+    from app.adapters.system.celery_job_queue import CeleryJobQueue
+
+    return CeleryJobQueue()
+
+
+@cache
+def export_service() -> ExportService:
+    from app.domain.export_service import ExportService
+
+    return ExportService(store=result_store())
+
+
+# ==== worker role ====
+
+
+@cache
+def fingerprint_repo() -> FingerprintRepositoryPort:
+    from app.adapters.repositories.rapid7_recog_repo import Rapid7RecogRepository
+
+    repo = Rapid7RecogRepository(settings.FAVICONS_PATH)
+    if settings.FAVICONS_RELOAD_SECONDS > 0:
+        repo.start_watching(settings.FAVICONS_RELOAD_SECONDS)
+    return repo
+
+
+@cache
+def http_fetcher() -> HTTPFetcherPort:
+    if settings.FETCH_REPLAY_PATH:
+        from app.adapters.http.replay_fetcher import ReplayFetcher
+
+        return ReplayFetcher(settings.FETCH_REPLAY_PATH)
+
+    fetcher = _network_fetcher()
+    if settings.FETCH_RECORD_PATH:
+        from app.adapters.http.recording_fetcher import RecordingFetcher
+
+        # one archive per process: prefork workers must not interleave appends
+        return RecordingFetcher(fetcher, settings.FETCH_RECORD_PATH.format(pid=os.getpid()))
+    return fetcher
+
+
+def _network_fetcher() -> HTTPFetcherPort:
+    if settings.HTTP_FETCHER == "asyncio":
+        from app.adapters.http.asyncio_fetcher import AsyncioFetcher
+
+        return AsyncioFetcher()
+    if settings.HTTP_FETCHER == "aiohttp":
+        from app.adapters.http.aiohttp_fetcher import AiohttpFetcher
+
+        return AiohttpFetcher()
+    raise ValueError(f"unknown HTTP_FETCHER: {settings.HTTP_FETCHER!r}")
+
+
+@cache
+def target_expander() -> TargetExpanderPort:
+    from app.adapters.system.target_expander_impl import TargetExpander
+
+    return TargetExpander()
+
+
+@cache
+def blob_store() -> BlobStorePort | None:
+    if not settings.BLOB_STORE:
+        return None
+    if settings.BLOB_STORE == "fs":
+        from app.adapters.system.fs_blob_store import FilesystemBlobStore
+
+        return FilesystemBlobStore(settings.BLOB_DIR)
+    if settings.BLOB_STORE == "redis":
+        from app.adapters.system.redis_blob_store import RedisBlobStore
+
+        return RedisBlobStore(settings.REDIS_URL)
+    raise ValueError(f"unknown BLOB_STORE: {settings.BLOB_STORE!r}")
+
+
+@cache
+def scan_service() -> ScanService:
+    from app.domain.scan_service import ScanService
+
+    return ScanService(
+        repo=fingerprint_repo(),
+        fetcher=http_fetcher(),
+        expander=target_expander(),
+        default_ports=settings.DEFAULT_PORTS,
+        max_targets=settings.MAX_TARGETS,
+        blobs=blob_store(),
+        traversal=settings.TRAVERSAL,
+        seed=settings.TRAVERSAL_SEED,
+    )
+
+
+@cache
+def rematch_service() -> RematchService:
+    from app.domain.rematch_service import RematchService
+
+    return RematchService(repo=fingerprint_repo(), store=result_store())
+
+
+def reset() -> None:
+    """Drop every cached provider (tests, or after a fork that must not share state)."""
+    for provider in (
+        result_store,
+        job_queue,
+        export_service,
+        fingerprint_repo,
+        http_fetcher,
+        target_expander,
+        blob_store,
+        scan_service,
+        rematch_service,
+    ):
+        provider.cache_clear()
@@ -0,0 +1,42 @@
+# /app/adapters/system/fs_blob_store.py
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+LOG = logging.getLogger("adapter.blob_store.fs")
+
+
+class FilesystemBlobStore:
+    """Content-addressed bodies on disk: <root>/<digest[:2]>/<digest>, written once."""
+
+    def __init__(self, root: str) -> None:
+        self._root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        return self._root / digest[:2] / digest
+
+    def put(self, digest: str, body: bytes) -> bool:
+        path = self._path(digest)
+        if path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename so concurrent writers and readers never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        LOG.info("blob.stored", extra={"extra": {"digest": digest, "bytes": len(body)}})
+        return True
+
+    def get(self, digest: str) -> bytes | None:
+        try:
+            return self._path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
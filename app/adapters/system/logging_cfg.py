@@ -4,10 +4,10 @@ from __future__ import annotations
 import json
 import logging
 import sys
-from typing import Any
+from typing import Any, TextIO
 
 
-def configure_logger(level: int = logging.INFO) -> None:
+def configure_logger(level: int = logging.INFO, stream: TextIO | None = None) -> None:
     class JSONHandler(logging.StreamHandler):
         def emit(self, record: logging.LogRecord) -> None:
             payload: dict[str, Any] = {
@@ -24,4 +24,4 @@ def configure_logger(level: int = logging.INFO) -> None:
     root = logging.getLogger()
     root.handlers.clear()
     root.setLevel(level)
-    root.addHandler(JSONHandler(stream=sys.stdout))
+    root.addHandler(JSONHandler(stream=stream or sys.stdout))
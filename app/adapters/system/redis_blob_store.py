@@ -0,0 +1,30 @@
+# mypy: ignore-errors
+# /app/adapters/system/redis_blob_store.py
+from __future__ import annotations
+
+import logging
+
+import redis
+
+LOG = logging.getLogger("adapter.blob_store.redis")
+
+
+class RedisBlobStore:
+    """Content-addressed bodies in Redis strings, one key per digest (SET NX)."""
+
+    def __init__(self, redis_url: str, prefix: str = "blob") -> None:
+        # bodies are binary, so this client must not decode responses
+        self._r = redis.Redis.from_url(redis_url)
+        self._prefix = prefix
+
+    def _key(self, digest: str) -> str:
+        return f"{self._prefix}:{digest}"
+
+    def put(self, digest: str, body: bytes) -> bool:
+        stored = bool(self._r.set(self._key(digest), body, nx=True))
+        if stored:
+            LOG.info("blob.stored", extra={"extra": {"digest": digest, "bytes": len(body)}})
+        return stored
+
+    def get(self, digest: str) -> bytes | None:
+        return self._r.get(self._key(digest))
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import json
 import logging
+import time
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 import redis
@@ -19,6 +21,14 @@ class RedisResultStore:
     def _key(self, scan_id: str) -> str:
         return f"{self._prefix}:{scan_id}"
 
+    def _finished_key(self) -> str:
+        # time index: completed scan_ids scored by finished_at (unix seconds)
+        return f"{self._prefix}:finished"
+
+    def _md5_key(self, md5: str) -> str:
+        # reverse index: one set of "scan_id|target" members per favicon md5
+        return f"{self._prefix}:by_md5:{md5}"
+
     def set_pending(self, scan_id: str) -> None:
         self._r.hset(self._key(scan_id), mapping={"status": "pending"})
         LOG.info("store.set_pending", extra={"extra": {"scan_id": scan_id}})
@@ -28,7 +38,17 @@ class RedisResultStore:
         LOG.warning("store.set_error", extra={"extra": {"scan_id": scan_id, "error": error}})
 
     def set_result(self, scan_id: str, result: dict) -> None:
-        self._r.hset(self._key(scan_id), mapping={"status": "done", "result": json.dumps(result)})
+        now = time.time()
+        pipe = self._r.pipeline()
+        pipe.hset(
+            self._key(scan_id),
+            mapping={"status": "done", "result": json.dumps(result), "finished_at": now},
+        )
+        pipe.zadd(self._finished_key(), {scan_id: now})
+        for r in result.get("results") or []:
+            if r.get("md5"):
+                pipe.sadd(self._md5_key(r["md5"]), f"{scan_id}|{r['target']}")
+        pipe.execute()
         LOG.info("store.set_result", extra={"extra": {"scan_id": scan_id}})
 
     def get(self, scan_id: str) -> dict | None:
@@ -38,9 +58,60 @@ class RedisResultStore:
         out: dict[str, Any] = {"status": data.get("status")}
         if "error" in data:
             out["error"] = data["error"]
+        if "finished_at" in data:
+            out["finished_at"] = float(data["finished_at"])
         if "result" in data and data["result"] is not None:
             try:
                 out["result"] = json.loads(data["result"])
             except Exception:
                 out["result"] = None
         return out
+
+    def finished_between(
+        self, since: float | None, until: float | None, *, page: int = 500
+    ) -> Iterator[str]:
+        lo = "-inf" if since is None else since
+        hi = "+inf" if until is None else until
+        offset = 0
+        while True:
+            ids = self._r.zrangebyscore(self._finished_key(), lo, hi, start=offset, num=page)
+            yield from ids
+            if len(ids) < page:
+                return
+            offset += page
+
+    def targets_for_md5s(self, md5s: Iterable[str]) -> dict[str, dict[str, str]]:
+        md5s = list(md5s)
+        pipe = self._r.pipeline(transaction=False)
+        for md5 in md5s:
+            pipe.smembers(self._md5_key(md5))
+
+        hits: dict[str, dict[str, str]] = {}
+        for md5, members in zip(md5s, pipe.execute(), strict=True):
+            for member in members:
+                scan_id, _, target = member.partition("|")
+                hits.setdefault(scan_id, {})[target] = md5
+        return hits
+
+    def patch_results(self, scan_id: str, patches: dict[str, dict]) -> int:
+        key = self._key(scan_id)
+
+        def _patch(pipe: redis.client.Pipeline) -> int:
+            # read-modify-write under WATCH: a concurrent set_result or rematch on this key
+            # aborts EXEC and redis-py re-runs us on the fresh blob
+            raw = pipe.hget(key, "result")
+            if not raw:
+                return 0
+            result = json.loads(raw)
+            updated = 0
+            for r in result.get("results") or []:
+                patch = patches.get(r.get("target"))
+                if patch is not None:
+                    r.update(patch)
+                    updated += 1
+            if updated:
+                pipe.multi()
+                pipe.hset(key, mapping={"result": json.dumps(result)})
+            return updated
+
+        return self._r.transaction(_patch, key, value_from_callable=True)
@@ -0,0 +1,56 @@
+# /app/adapters/system/rematch_cli.py
+"""
+Re-match stored scan results after a Recog update, without re-scanning:
+
+    python -m app.adapters.system.rematch_cli OLD.xml NEW.xml [--inline]
+
+Only md5s whose fingerprints differ between the two files are touched. By default a
+``rematch_job`` is enqueued and applies the DB a worker has loaded once that is no
+longer OLD.xml; ``--inline`` applies NEW.xml directly from this process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+
+from app.adapters.repositories.rapid7_recog_repo import (
+    FixedIndexRepository,
+    diff_md5s,
+    parse_recog_xml,
+)
+from app.adapters.system import container
+from app.adapters.system.logging_cfg import configure_logger
+from app.domain.rematch_service import RematchService
+
+LOG = logging.getLogger("adapter.rematch_cli")
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Re-match stored results after a DB update.")
+    ap.add_argument("old_xml")
+    ap.add_argument("new_xml")
+    ap.add_argument("--inline", action="store_true", help="run here instead of enqueueing")
+    args = ap.parse_args(argv)
+    configure_logger()
+
+    old = parse_recog_xml(Path(args.old_xml).read_bytes())
+    new = parse_recog_xml(Path(args.new_xml).read_bytes())
+    md5s = sorted(diff_md5s(old, new))
+    LOG.info(
+        "rematch.diff", extra={"extra": {"from": old.version, "to": new.version, "md5s": len(md5s)}}
+    )
+    if not md5s:
+        return
+
+    if args.inline:
+        # NEW.xml is already parsed: apply that index instead of loading the file again
+        RematchService(FixedIndexRepository(new), container.result_store()).rematch(md5s)
+    else:
+        job_id = container.job_queue().enqueue("rematch_job", args=[md5s, old.version])
+        LOG.info("rematch.enqueued", extra={"extra": {"job_id": job_id}})
+
+
+if __name__ == "__main__":
+    main()
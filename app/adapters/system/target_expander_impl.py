@@ -2,26 +2,91 @@
 from __future__ import annotations
 
 import logging
-from ipaddress import ip_address, ip_network
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, ip_address, ip_network
 
 LOG = logging.getLogger("adapter.target_expander")
 
 
+class JobSpace:
+    """
+    Random-access view of targets x ports: index j -> (host, port), in O(#inputs) memory.
+
+    CIDRs are kept as (first address, host count) ranges matching ``net.hosts()``, so a
+    /8 costs the same as a single host. Index j maps to host j // len(ports).
+    """
+
+    def __init__(self, inputs: Iterable[str], ports: Sequence[int]) -> None:
+        self.ports = list(ports)
+        # (first index, first address as int | None, version, hostname) per input
+        self._ranges: list[tuple[int, int | None, int, str]] = []
+        self._starts: list[int] = []
+        hosts = 0
+        for item in inputs:
+            s = item.strip()
+            if not s:
+                continue
+            first, count, version = self._parse(s)
+            self._starts.append(hosts)
+            self._ranges.append((hosts, first, version, s))
+            hosts += count
+        self.hosts = hosts
+        self.size = hosts * len(self.ports)
+
+    @staticmethod
+    def _parse(s: str) -> tuple[int | None, int, int]:
+        try:
+            if "/" in s:
+                net = ip_network(s, strict=False)
+                first, total = int(net.network_address), net.num_addresses
+                # same exclusions as net.hosts(): network/broadcast (v4), subnet-router (v6)
+                tail = 31 if isinstance(net, IPv4Network) else 127
+                if net.prefixlen >= tail:
+                    return first, total, net.version
+                skip = 2 if isinstance(net, IPv4Network) else 1
+                return first + 1, total - skip, net.version
+            addr = ip_address(s)
+            return int(addr), 1, addr.version
+        except ValueError:
+            return None, 1, 0  # hostname
+
+    def host_at(self, i: int) -> str:
+        k = bisect_right(self._starts, i) - 1
+        start, first, version, name = self._ranges[k]
+        if first is None:
+            return name
+        addr_cls = IPv4Address if version == 4 else IPv6Address
+        return str(addr_cls(first + (i - start)))
+
+    def pair_at(self, j: int) -> tuple[str, int]:
+        h, p = divmod(j, len(self.ports))
+        return self.host_at(h), self.ports[p]
+
+    def pairs(self, indices: Iterable[int]) -> Iterator[tuple[str, int]]:
+        for j in indices:
+            yield self.pair_at(j)
+
+
 class TargetExpander:
-    def expand(self, inputs: list[str], max_targets: int) -> list[str]:
-        hosts: list[str] = []
+    @staticmethod
+    def iter_hosts(inputs: Iterable[str]) -> Iterator[str]:
+        """Lazy expansion, O(1) memory per CIDR (batch CLI feeds it unbounded streams)."""
         for item in inputs:
             s = item.strip()
             try:
                 if "/" in s:
                     net = ip_network(s, strict=False)
                     for addr in net.hosts():
-                        hosts.append(str(addr))
+                        yield str(addr)
                 else:
                     ip_address(s)  # validates or raises
-                    hosts.append(s)
-            except Exception:
-                hosts.append(s)  # treat as hostname
+                    yield s
+            except ValueError:
+                yield s  # treat as hostname
+
+    def expand(self, inputs: list[str], max_targets: int) -> list[str]:
+        hosts = list(self.iter_hosts(inputs))
 
         if len(hosts) > max_targets:
             LOG.warning("expanded targets exceed max", extra={"extra": {"max": max_targets}})
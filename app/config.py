@@ -21,10 +21,33 @@ class Settings(BaseModel):
     MAX_BYTES: int = int(os.getenv("MAX_BYTES", "2097152"))  # 2 MB
     RETRIES: int = int(os.getenv("RETRIES", "1"))
     RETRY_BACKOFF_MS: int = int(os.getenv("RETRY_BACKOFF_MS", "250"))
+    MAX_REDIRECTS: int = int(os.getenv("MAX_REDIRECTS", "5"))
+
+    # HTTP client: "aiohttp" (default) or "asyncio" (bare streams, less CPU per probe)
+    HTTP_FETCHER: str = os.getenv("HTTP_FETCHER", "aiohttp")
+    # TLS: resumable sessions kept per server hostname (0 disables resumption), and
+    # threads that run handshakes off the event loop (asyncio fetcher only; 0 = inline)
+    TLS_SESSION_CACHE: int = int(os.getenv("TLS_SESSION_CACHE", "4096"))
+    TLS_HANDSHAKE_THREADS: int = int(os.getenv("TLS_HANDSHAKE_THREADS", "0"))
+    # Fetch archive: record every outcome to a file ("{pid}" is replaced per process),
+    # or serve fetches from one instead of the network. Both empty by default.
+    FETCH_RECORD_PATH: str = os.getenv("FETCH_RECORD_PATH", "")
+    FETCH_REPLAY_PATH: str = os.getenv("FETCH_REPLAY_PATH", "")
 
     # Dataset / defaults
     FAVICONS_PATH: str = os.getenv("FAVICONS_PATH", "./data/favicons.xml")
+    # poll FAVICONS_PATH for changes and hot-swap the index; 0 disables
+    FAVICONS_RELOAD_SECONDS: float = float(os.getenv("FAVICONS_RELOAD_SECONDS", "30"))
     DEFAULT_PORTS: list[int] = [80, 443, 8080]
+    # Probe order: "sequential" (host-major) or "random" (spread across subnets and ports)
+    TRAVERSAL: str = os.getenv("TRAVERSAL", "sequential")
+    TRAVERSAL_SEED: int | None = (
+        int(os.environ["TRAVERSAL_SEED"]) if os.getenv("TRAVERSAL_SEED") else None
+    )
+
+    # Favicon body retention (content-addressed, one copy per distinct body): "", "fs", "redis"
+    BLOB_STORE: str = os.getenv("BLOB_STORE", "")
+    BLOB_DIR: str = os.getenv("BLOB_DIR", "./data/blobs")
 
     # Celery / Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
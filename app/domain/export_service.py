@@ -0,0 +1,148 @@
+# /app/domain/export_service.py
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from app.ports.result_store import ResultStorePort
+
+LOG = logging.getLogger("export_service")
+
+# Flat export schema: one row per (result, match); a result without matches is one row
+# with empty match columns, and (optionally) a failed probe is one row with ``error``.
+# The most common Recog properties get their own columns; ``properties`` keeps them all.
+PROMOTED_PROPERTIES = (
+    "service.vendor",
+    "service.product",
+    "service.version",
+    "os.vendor",
+    "os.product",
+    "os.family",
+    "hw.vendor",
+    "hw.product",
+    "hw.device",
+)
+EXPORT_COLUMNS = (
+    "scan_id",
+    "finished_at",  # unix seconds; encoders render it for their format
+    "target",
+    "host",
+    "port",
+    "scheme",
+    "status",
+    "bytes",
+    "md5",
+    "sha256",
+    "final_url",
+    "db_version",
+    "match_name",
+    *(p.replace(".", "_") for p in PROMOTED_PROPERTIES),
+    "properties",  # JSON object of every property of the match
+    "error",
+    "detail",
+)
+
+# ==== DTOs ====
+
+
+@dataclass(slots=True)
+class ExportQueryDTO:
+    scan_ids: list[str] = field(default_factory=list)  # empty: every scan in the time range
+    since: float | None = None
+    until: float | None = None
+    match_names: list[str] = field(default_factory=list)  # case-insensitive, any of
+    include_errors: bool = False
+
+
+# ==== Service ====
+
+
+class ExportService:
+    """
+    Streams stored results as flat rows across scans. Scans are read from the store one
+    at a time, so memory is bounded by the largest single scan, not by the export.
+    """
+
+    def __init__(self, store: ResultStorePort) -> None:
+        self.store = store
+
+    def _scan_ids(self, q: ExportQueryDTO) -> Iterator[str]:
+        if q.scan_ids:
+            return iter(dict.fromkeys(q.scan_ids))  # time bounds are checked per scan
+        return self.store.finished_between(q.since, q.until)
+
+    @staticmethod
+    def _in_range(q: ExportQueryDTO, finished_at: float | None) -> bool:
+        if q.since is None and q.until is None:
+            return True
+        if finished_at is None:
+            return False  # stored before finished_at was recorded
+        return (q.since is None or finished_at >= q.since) and (
+            q.until is None or finished_at <= q.until
+        )
+
+    @staticmethod
+    def _base(scan_id: str, finished_at: float | None, target: str) -> dict:
+        host, _, port = target.rpartition(":")
+        row = dict.fromkeys(EXPORT_COLUMNS)
+        row.update(
+            scan_id=scan_id,
+            finished_at=finished_at,
+            target=target,
+            host=host,
+            port=int(port) if port.isdigit() else None,
+        )
+        return row
+
+    def _result_rows(self, scan_id: str, finished_at: float | None, r: dict) -> Iterator[dict]:
+        base = self._base(scan_id, finished_at, r.get("target") or "")
+        base.update(
+            scheme=r.get("scheme"),
+            status=r.get("status"),
+            bytes=r.get("bytes"),
+            md5=r.get("md5"),
+            sha256=r.get("sha256"),
+            final_url=r.get("final_url"),
+            db_version=r.get("db_version"),
+        )
+        matches = r.get("matches") or []
+        if not matches:
+            yield base
+            return
+        for m in matches:
+            props = m.get("properties") or {}
+            row = dict(base, match_name=m.get("name"), properties=json.dumps(props))
+            for p in PROMOTED_PROPERTIES:
+                row[p.replace(".", "_")] = props.get(p)
+            yield row
+
+    def rows(self, q: ExportQueryDTO) -> Iterator[dict]:
+        names = {n.lower() for n in q.match_names}
+        scans = rows = 0
+        for scan_id in self._scan_ids(q):
+            entry = self.store.get(scan_id)
+            if not entry or entry.get("status") != "done":
+                continue
+            finished_at = entry.get("finished_at")
+            if not self._in_range(q, finished_at):
+                continue
+            scans += 1
+            result = entry.get("result") or {}
+
+            for r in result.get("results") or []:
+                for row in self._result_rows(scan_id, finished_at, r):
+                    if names and (row["match_name"] or "").lower() not in names:
+                        continue
+                    rows += 1
+                    yield row
+
+            if q.include_errors and not names:
+                for e in result.get("errors") or []:
+                    row = self._base(scan_id, finished_at, e.get("target") or "")
+                    row.update(error=e.get("error"), detail=e.get("detail"))
+                    rows += 1
+                    yield row
+
+        LOG.info("export.done", extra={"extra": {"scans": scans, "rows": rows}})
@@ -0,0 +1,112 @@
+# /app/domain/permutation.py
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Iterator
+
+# Deterministic Miller-Rabin witnesses for every n < 3.3e24
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def _is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for b in _MR_BASES:
+        if n % b == 0:
+            return n == b
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _next_prime(n: int) -> int:
+    while not _is_prime(n):
+        n += 1
+    return n
+
+
+def _pollard_rho(n: int, rng: random.Random) -> int:
+    if n % 2 == 0:
+        return 2
+    while True:
+        c = rng.randrange(1, n)
+        x = y = rng.randrange(2, n)
+        d = 1
+        while d == 1:
+            x = (x * x + c) % n
+            y = (y * y + c) % n
+            y = (y * y + c) % n
+            d = math.gcd(abs(x - y), n)
+        if d != n:
+            return d
+
+
+def _prime_factors(n: int, rng: random.Random) -> set[int]:
+    if n == 1:
+        return set()
+    if _is_prime(n):
+        return {n}
+    d = _pollard_rho(n, rng)
+    return _prime_factors(d, rng) | _prime_factors(n // d, rng)
+
+
+class CyclicPermutation:
+    """
+    Pseudorandom permutation of range(n) in O(1) memory.
+
+    Walks the multiplicative group of integers mod a prime p > n from a random start
+    with a random generator g: x -> x*g mod p visits every element of 1..p-1 exactly
+    once, and elements above n are skipped. The same seed gives the same order.
+
+    Positions 0..period-1 index the walk, so a range of positions (or every k-th
+    position, see ``iter_range``) can be handed out and resumed independently.
+    """
+
+    def __init__(self, n: int, seed: int | None = None) -> None:
+        self.n = n
+        self.p = _next_prime(n + 1)
+        self.period = self.p - 1
+        rng = random.Random(seed)
+        self.g = self._random_generator(rng)
+        self.start = rng.randrange(1, self.p)
+
+    def _random_generator(self, rng: random.Random) -> int:
+        if self.p <= 3:
+            return self.p - 1  # 1 generates {1}; 2 generates {1, 2}
+        factors = _prime_factors(self.period, rng)
+        while True:
+            g = rng.randrange(2, self.p)
+            if all(pow(g, self.period // q, self.p) != 1 for q in factors):
+                return g
+
+    def _walk(self, first: int, step: int, count: int) -> Iterator[int]:
+        x = self.start * pow(self.g, first, self.p) % self.p
+        mult = pow(self.g, step, self.p)
+        n = self.n
+        for _ in range(count):
+            if x <= n:
+                yield x - 1
+            x = x * mult % self.p
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self) -> Iterator[int]:
+        return self._walk(0, 1, self.period)
+
+    def iter_range(self, first: int, stop: int, step: int = 1) -> Iterator[int]:
+        """Indices at walk positions range(first, stop, step), clipped to the period."""
+        positions = range(max(first, 0), min(stop, self.period), step)
+        return self._walk(positions.start, step, len(positions))
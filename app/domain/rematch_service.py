@@ -0,0 +1,51 @@
+# /app/domain/rematch_service.py
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+
+from app.ports.fingerprint_repository import FingerprintRepositoryPort
+from app.ports.result_store import ResultStorePort
+
+LOG = logging.getLogger("rematch_service")
+
+# ==== DTOs ====
+
+
+@dataclass(slots=True)
+class RematchReportDTO:
+    db_version: str
+    md5s: int
+    scans: int
+    results: int
+
+
+# ==== Service ====
+
+
+class RematchService:
+    """Re-applies the current fingerprint DB to stored results, without any network I/O."""
+
+    def __init__(self, repo: FingerprintRepositoryPort, store: ResultStorePort) -> None:
+        self.repo = repo
+        self.store = store
+
+    def rematch(self, md5s: Iterable[str]) -> RematchReportDTO:
+        db = self.repo.snapshot()
+        wanted = {m.lower() for m in md5s}
+        hits = self.store.targets_for_md5s(wanted)
+
+        updated = 0
+        for scan_id, targets in hits.items():
+            patches = {
+                target: {"matches": db.lookup_md5(md5), "db_version": db.version}
+                for target, md5 in targets.items()
+            }
+            updated += self.store.patch_results(scan_id, patches)
+
+        report = RematchReportDTO(
+            db_version=db.version, md5s=len(wanted), scans=len(hits), results=updated
+        )
+        LOG.info("rematch.done", extra={"extra": asdict(report)})
+        return report
@@ -4,12 +4,14 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import logging
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
 
 from app.adapters.system.logging_cfg import configure_logger
 from app.config import settings
-from app.ports.fingerprint_repository import FingerprintRepositoryPort
+from app.domain.permutation import CyclicPermutation
+from app.ports.blob_store import BlobStorePort
+from app.ports.fingerprint_repository import FingerprintIndexPort, FingerprintRepositoryPort
 from app.ports.http_fetcher import HTTPFetcherPort
 from app.ports.target_expander import TargetExpanderPort
 
@@ -34,6 +36,21 @@ class ScanResultDTO:
     status: int
     final_url: str | None
     matches: list[dict]
+    db_version: str | None = None  # fingerprint DB version the matches came from
+    sha256: str | None = None  # blob store key of the body, when a blob store is configured
+
+    def as_dict(self) -> dict:
+        return {
+            "target": self.target,
+            "scheme": self.scheme,
+            "bytes": self.byte_len,
+            "md5": self.md5,
+            "status": self.status,
+            "final_url": self.final_url,
+            "matches": self.matches,
+            "db_version": self.db_version,
+            "sha256": self.sha256,
+        }
 
 
 @dataclass(slots=True)
@@ -42,6 +59,22 @@ class ScanResponseDTO:
     errors: list[dict]
 
 
+@dataclass(slots=True)
+class _Favicon:
+    """Per-job memo entry: everything derived from one distinct body."""
+
+    sha256: str | None
+    matches: list[dict]
+
+
+@dataclass(slots=True)
+class ScanContext:
+    """Per-job state shared by its probes: the pinned DB snapshot and the md5 memo."""
+
+    db: FingerprintIndexPort
+    memo: dict[str, _Favicon] = field(default_factory=dict)
+
+
 # ==== Service ====
 
 
@@ -56,12 +89,20 @@ class ScanService:
         *,
         default_ports: Sequence[int],
         max_targets: int,
+        blobs: BlobStorePort | None = None,
+        traversal: str = "sequential",
+        seed: int | None = None,
     ) -> None:
+        if traversal not in ("sequential", "random"):
+            raise ValueError(f"unknown traversal: {traversal!r}")
         self.repo = repo
         self.fetcher = fetcher
         self.expander = expander
         self.default_ports = list(default_ports)
         self.max_targets = max_targets
+        self.blobs = blobs
+        self.traversal = traversal
+        self.seed = seed
 
     # --- small helpers to keep scan() simple ---
 
@@ -77,6 +118,13 @@ class ScanService:
     def _expand_hosts(self, targets: list[str]) -> list[str]:
         return self.expander.expand(targets, self.max_targets)
 
+    def _job_order(self, size: int) -> Iterable[int]:
+        # "random": pseudorandom walk over host x port indices, so consecutive probes hit
+        # unrelated subnets and ports instead of all ports of one /24 at a time
+        if self.traversal == "random":
+            return CyclicPermutation(size, self.seed)
+        return range(size)
+
     @staticmethod
     def _validate_job_size(hosts_count: int, ports_count: int) -> None:
         total_pairs = hosts_count * ports_count
@@ -89,9 +137,18 @@ class ScanService:
         async with asyncio.timeout(settings.TIMEOUT_SECONDS + 0.5):
             return await self.fetcher.fetch(scheme, host, port, "/favicon.ico")
 
-    def _make_result(
+    @staticmethod
+    async def _store_body(blobs: BlobStorePort, sha256: str, body: bytes) -> None:
+        try:
+            await asyncio.to_thread(blobs.put, sha256, body)
+        except Exception:
+            # retention is best effort; never fail a probe because the blob store is down
+            LOG.exception("favicon.blob_store_failed", extra={"extra": {"sha256": sha256}})
+
+    async def _make_result(
         self,
         *,
+        ctx: ScanContext,
         host: str,
         port: int,
         scheme: str,
@@ -100,12 +157,21 @@ class ScanService:
         final_url: str | None,
     ) -> ScanResultDTO:
         md5: str | None = None
-        matches: list[dict] = []
+        fav = _Favicon(sha256=None, matches=[])
 
         if 200 <= status < 300 and body:
             md5 = hashlib.md5(body).hexdigest()
             LOG.info("favicon.md5", extra={"extra": {"md5": md5}})
-            matches = self.repo.lookup_md5(md5)
+            cached = ctx.memo.get(md5)
+            if cached is not None:
+                fav = cached
+            else:
+                # first time this job sees the body: look it up (and store it) once
+                blobs = self.blobs
+                sha256 = hashlib.sha256(body).hexdigest() if blobs is not None else None
+                fav = ctx.memo[md5] = _Favicon(sha256=sha256, matches=ctx.db.lookup_md5(md5))
+                if blobs is not None and sha256 is not None:
+                    await self._store_body(blobs, sha256, body)
 
         return ScanResultDTO(
             target=f"{host}:{port}",
@@ -114,36 +180,49 @@ class ScanService:
             md5=md5,
             status=status,
             final_url=final_url,
-            matches=matches,
+            matches=fav.matches,
+            db_version=ctx.db.version,
+            sha256=fav.sha256,
         )
 
+    @staticmethod
+    def error_for(host: str, port: int, exc: Exception) -> dict:
+        return {"target": f"{host}:{port}", "error": type(exc).__name__, "detail": str(exc)}
+
     async def _probe_one(
         self,
+        ctx: ScanContext,
         host: str,
         port: int,
         results: list[ScanResultDTO],
         errors: list[dict],
         sem: asyncio.Semaphore,
     ) -> None:
-        scheme = self._scheme_for(port)
-        target = f"{host}:{port}"
         async with sem:
             try:
-                status, body, final_url = await self._fetch_favicon(scheme, host, port)
+                results.append(await self.probe(ctx, host, port))
             except Exception as e:
-                errors.append({"target": target, "error": type(e).__name__, "detail": str(e)})
-                return
-
-            results.append(
-                self._make_result(
-                    host=host,
-                    port=port,
-                    scheme=scheme,
-                    status=status,
-                    body=body,
-                    final_url=final_url,
-                )
-            )
+                errors.append(self.error_for(host, port, e))
+
+    # --- streaming building blocks (batch CLI drives these without the job caps) ---
+
+    def new_context(self) -> ScanContext:
+        # pin one DB version per job; a hot reload mid-scan applies to the next job
+        return ScanContext(db=self.repo.snapshot())
+
+    async def probe(self, ctx: ScanContext, host: str, port: int) -> ScanResultDTO:
+        """Fetch and fingerprint one host:port. Fetch failures propagate to the caller."""
+        scheme = self._scheme_for(port)
+        status, body, final_url = await self._fetch_favicon(scheme, host, port)
+        return await self._make_result(
+            ctx=ctx,
+            host=host,
+            port=port,
+            scheme=scheme,
+            status=status,
+            body=body,
+            final_url=final_url,
+        )
 
     # --- primary entrypoint kept linear/simple ---
 
@@ -155,10 +234,12 @@ class ScanService:
         results: list[ScanResultDTO] = []
         errors: list[dict] = []
         sem = asyncio.Semaphore(settings.CONCURRENCY)
+        ctx = self.new_context()
 
         async with asyncio.TaskGroup() as tg:
-            for h in hosts:
-                for p in ports:
-                    tg.create_task(self._probe_one(h, p, results, errors, sem))
+            # tasks take the semaphore in creation order, so this is also the probe order
+            for j in self._job_order(len(hosts) * len(ports)):
+                h, p = divmod(j, len(ports))
+                tg.create_task(self._probe_one(ctx, hosts[h], ports[p], results, errors, sem))
 
         return ScanResponseDTO(results=results, errors=errors)
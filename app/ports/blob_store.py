@@ -0,0 +1,12 @@
+# /app/ports/blob_store.py
+from __future__ import annotations
+
+from typing import Protocol
+
+
+class BlobStorePort(Protocol):
+    def put(self, digest: str, body: bytes) -> bool:
+        """Store body under its sha256 hex digest; return False if it was already stored."""
+
+    def get(self, digest: str) -> bytes | None:
+        """Return the stored body for digest, or None."""
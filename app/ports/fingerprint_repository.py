@@ -4,6 +4,19 @@ from __future__ import annotations
 from typing import Protocol
 
 
+class FingerprintIndexPort(Protocol):
+    """One immutable, versioned view of the fingerprint DB."""
+
+    @property
+    def version(self) -> str: ...
+
+    def lookup_md5(self, md5: str) -> list[dict]:
+        """Return 0..N fingerprint dicts for MD5 (name/properties)."""
+
+
 class FingerprintRepositoryPort(Protocol):
     def lookup_md5(self, md5: str) -> list[dict]:
         """Return 0..N fingerprint dicts for MD5 (name/properties)."""
+
+    def snapshot(self) -> FingerprintIndexPort:
+        """Current index; stays consistent for as long as the caller holds it."""
@@ -1,6 +1,7 @@
 # /app/ports/result_store.py
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from typing import Protocol
 
 
@@ -9,3 +10,12 @@ class ResultStorePort(Protocol):
     def set_error(self, scan_id: str, error: str) -> None: ...
     def set_result(self, scan_id: str, result: dict) -> None: ...
     def get(self, scan_id: str) -> dict | None: ...
+
+    def finished_between(self, since: float | None, until: float | None) -> Iterator[str]:
+        """scan_ids of completed scans with since <= finished_at <= until, oldest first."""
+
+    def targets_for_md5s(self, md5s: Iterable[str]) -> dict[str, dict[str, str]]:
+        """Reverse index lookup: scan_id -> {target: md5} for stored results with these md5s."""
+
+    def patch_results(self, scan_id: str, patches: dict[str, dict]) -> int:
+        """Merge patches[target] into that target's stored result; return entries updated."""
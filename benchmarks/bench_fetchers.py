@@ -0,0 +1,134 @@
+# /benchmarks/bench_fetchers.py
+"""
+Probes per CPU-second for each HTTPFetcherPort against a local favicon server.
+
+The server runs in a separate process and answers with ``Connection: close`` so that,
+as in a real sweep over distinct hosts, no fetcher gets to reuse connections:
+
+    python benchmarks/bench_fetchers.py [--probes 5000] [--concurrency 200]
+
+``--tls`` serves HTTPS with a throwaway self-signed certificate (needs the openssl CLI)
+and compares each fetcher with TLS session resumption off and on, plus the asyncio
+fetcher with handshakes in a thread pool. Every probe is a new connection, so every
+probe is a handshake; the resumption rate shows how many were abbreviated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+ICON = b"\x00\x00\x01\x00" + os.urandom(1150)
+
+
+def _serve(port: int, ready: Event, cert_dir: str | None = None) -> None:
+    from aiohttp import web
+
+    ssl_ctx = None
+    if cert_dir:
+        ssl_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_ctx.load_cert_chain(f"{cert_dir}/cert.pem", f"{cert_dir}/key.pem")
+
+    async def icon(_: web.Request) -> web.Response:
+        return web.Response(body=ICON, headers={"Connection": "close"})
+
+    async def main() -> None:
+        app = web.Application()
+        app.router.add_get("/favicon.ico", icon)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port, backlog=4096, ssl_context=ssl_ctx).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def _mint_cert(cert_dir: str) -> None:
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:P-256",
+         "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+         "-keyout", f"{cert_dir}/key.pem", "-out", f"{cert_dir}/cert.pem"],
+        check=True,
+        capture_output=True,
+    )  # fmt: skip
+
+
+async def _run(fetcher: Any, scheme: str, port: int, probes: int) -> tuple[float, float]:
+    await fetcher.fetch(scheme, "127.0.0.1", port, "/favicon.ico")  # warm-up
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    await asyncio.gather(
+        *(fetcher.fetch(scheme, "127.0.0.1", port, "/favicon.ico") for _ in range(probes))
+    )
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+    await fetcher.close()
+    return wall, cpu
+
+
+def _variants(tls: bool) -> list[tuple[str, Any]]:
+    from app.adapters.http.aiohttp_fetcher import AiohttpFetcher
+    from app.adapters.http.asyncio_fetcher import AsyncioFetcher
+    from app.adapters.http.tls import TLSClient
+
+    if not tls:
+        return [("AiohttpFetcher", AiohttpFetcher()), ("AsyncioFetcher", AsyncioFetcher())]
+    threads = os.cpu_count() or 1
+    return [
+        ("aiohttp  no-resume", AiohttpFetcher(TLSClient(cache_size=0))),
+        ("aiohttp  resume", AiohttpFetcher(TLSClient())),
+        ("asyncio  no-resume", AsyncioFetcher(TLSClient(cache_size=0))),
+        ("asyncio  resume", AsyncioFetcher(TLSClient())),
+        (f"asyncio  resume+{threads}thr", AsyncioFetcher(TLSClient(handshake_threads=threads))),
+    ]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--probes", type=int, default=5000)
+    ap.add_argument("--concurrency", type=int, default=200)
+    ap.add_argument("--port", type=int, default=18081)
+    ap.add_argument("--tls", action="store_true", help="HTTPS, with and without resumption")
+    args = ap.parse_args()
+
+    # one host stands in for many: lift the per-host cap to the global one
+    os.environ["CONCURRENCY"] = os.environ["PER_HOST_LIMIT"] = str(args.concurrency)
+    scheme = "https" if args.tls else "http"
+
+    with tempfile.TemporaryDirectory() as cert_dir:
+        if args.tls:
+            _mint_cert(cert_dir)
+        ready = mp.Event()
+        server = mp.Process(
+            target=_serve, args=(args.port, ready, cert_dir if args.tls else None), daemon=True
+        )
+        server.start()
+        ready.wait(10)
+        try:
+            for name, fetcher in _variants(args.tls):
+                wall, cpu = asyncio.run(_run(fetcher, scheme, args.port, args.probes))
+                line = (
+                    f"{name:<24} {args.probes} probes  wall={wall:6.2f}s  cpu={cpu:6.2f}s  "
+                    f"probes/s={args.probes / wall:8.0f}  probes/cpu-s={args.probes / cpu:8.0f}"
+                )
+                if args.tls:
+                    st = fetcher.tls.stats()
+                    line += f"  handshakes={st['handshakes']}  resumed={st['resumption_rate']:.0%}"
+                print(line)
+        finally:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# /benchmarks/bench_replay.py
+"""
+ScanService throughput with the network taken out: every probe is served from a fetch
+archive (see RecordingFetcher), so the numbers measure hashing, matching and result
+building only, and are repeatable run to run.
+
+    FETCH_RECORD_PATH=sweep-{pid}.far celery ... # or favicon-batch-scan: record a real sweep
+    python benchmarks/bench_replay.py sweep-1234.far [--profile]
+    python benchmarks/bench_replay.py --synth 50000    # synthetic corpus, no recording needed
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _synth(path: Path, probes: int, distinct: int) -> None:
+    from app.adapters.http.fetch_archive import FetchArchiveWriter
+
+    rng = random.Random(0)
+    icons = [b"\x00\x00\x01\x00" + rng.randbytes(rng.randrange(300, 5000)) for _ in range(distinct)]
+    w = FetchArchiveWriter(path)
+    for i in range(probes):
+        host = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+        key = ("http", host, 80, "/favicon.ico")
+        if i % 5 == 4:
+            w.append(key, error=ConnectionRefusedError("refused"))
+        else:
+            w.append(
+                key, status=200, body=rng.choice(icons), final_url=f"http://{host}/favicon.ico"
+            )
+    w.close()
+
+
+async def _replay(service, keys: list) -> None:
+    ctx = service.new_context()
+    for _, host, port, _ in keys:
+        try:
+            await service.probe(ctx, host, port)
+        except Exception:
+            pass
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("archive", nargs="?", help="fetch archive to replay")
+    ap.add_argument("--synth", type=int, help="generate a synthetic archive with N probes")
+    ap.add_argument("--distinct", type=int, default=200, help="distinct bodies for --synth")
+    ap.add_argument("--profile", action="store_true", help="print the top cProfile entries")
+    args = ap.parse_args()
+    if not args.archive and not args.synth:
+        ap.error("give an archive or --synth N")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.archive) if args.archive else Path(tmp) / "synth.far"
+        if args.synth:
+            _synth(path, args.synth, args.distinct)
+        size = os.path.getsize(path)
+
+        # settings are read at import: wire the replay fetcher through the container
+        os.environ["FETCH_REPLAY_PATH"] = str(path)
+        os.environ["FAVICONS_RELOAD_SECONDS"] = "0"
+        from app.adapters.system import container
+        from app.adapters.system.logging_cfg import configure_logger
+        from app.domain import scan_service  # noqa: F401  (configures stdout logging on import)
+
+        configure_logger(logging.WARNING)  # per-probe INFO logs would dominate the profile
+        t0 = time.perf_counter()
+        keys = container.http_fetcher().keys()
+        load = time.perf_counter() - t0
+        service = container.scan_service()
+
+        prof = cProfile.Profile() if args.profile else None
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        if prof:
+            prof.enable()
+        asyncio.run(_replay(service, keys))
+        if prof:
+            prof.disable()
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+
+    print(
+        f"archive {size / 1e6:.1f} MB, {len(keys)} probes, loaded in {load:.2f}s\n"
+        f"replay  wall={wall:6.2f}s  cpu={cpu:6.2f}s  probes/cpu-s={len(keys) / cpu:8.0f}"
+    )
+    if prof:
+        pstats.Stats(prof).sort_stats("cumulative").print_stats(20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# /benchmarks/bench_startup.py
+"""
+Cold-start cost per process role: import + dependency wiring time and peak RSS.
+
+Each role runs in a fresh interpreter so module caches do not leak between runs:
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - t0
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+heavy = sorted(m for m in ("aiohttp", "xmltodict",
+                           "app.adapters.repositories.rapid7_recog_repo") if m in sys.modules)
+sys.stderr.write(json.dumps({{"seconds": elapsed, "rss_kb": rss_kb, "modules": heavy}}) + "\\n")
+"""
+
+ROLES: dict[str, str] = {
+    # what uvicorn does: import the app, then resolve the per-request dependencies once
+    "api": "from app.adapters.api import fastapi_app as m\nm.get_store(); m.get_queue()",
+    # what a Celery pool process does after worker_process_init
+    "worker": (
+        "from app.adapters.system import celery_app\n"
+        "from app.adapters.system import container\n"
+        "container.scan_service(); container.result_store()"
+    ),
+}
+
+
+def _run_once(body: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(body=body)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stderr.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    for role, body in ROLES.items():
+        samples = [_run_once(body) for _ in range(args.runs)]
+        secs = [s["seconds"] for s in samples]
+        rss = [s["rss_kb"] for s in samples]
+        print(
+            f"{role:<7} import+wire median={statistics.median(secs) * 1000:7.1f} ms  "
+            f"max_rss median={statistics.median(rss) / 1024:6.1f} MiB  "
+            f"loaded={samples[-1]['modules']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # tests/fakes.py
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 
 
@@ -21,6 +22,23 @@ class FakeFingerprintRepo:
         return out
 
 
+class FakeIndexRepo:
+    """FingerprintRepositoryPort over one fixed index (snapshot() never changes)."""
+
+    def __init__(self, index):
+        self.index = index
+
+    @property
+    def version(self):
+        return self.index.version
+
+    def snapshot(self):
+        return self.index
+
+    def lookup_md5(self, md5):
+        return self.index.lookup_md5(md5)
+
+
 class FakeFetcher:
     """
     Be liberal in what we accept:
@@ -73,8 +91,41 @@ class InMemoryResultStore:
     def set_error(self, scan_id, error):
         self._data[scan_id] = {"status": "error", "error": error}
 
-    def set_result(self, scan_id, result):
-        self._data[scan_id] = {"status": "done", "result": result}
+    def set_result(self, scan_id, result, finished_at=None):
+        finished_at = time.time() if finished_at is None else finished_at
+        self._data[scan_id] = {"status": "done", "result": result, "finished_at": finished_at}
 
     def get(self, scan_id):
         return self._data.get(scan_id)
+
+    def finished_between(self, since, until):
+        done = [(e["finished_at"], sid) for sid, e in self._data.items() if "finished_at" in e]
+        for ts, sid in sorted(done):
+            if (since is None or ts >= since) and (until is None or ts <= until):
+                yield sid
+
+    def targets_for_md5s(self, md5s):
+        md5s = set(md5s)
+        hits = {}
+        for scan_id, entry in self._data.items():
+            for r in (entry.get("result") or {}).get("results", []):
+                if r.get("md5") in md5s:
+                    hits.setdefault(scan_id, {})[r["target"]] = r["md5"]
+        return hits
+
+    def patch_results(self, scan_id, patches):
+        updated = 0
+        for r in (self._data.get(scan_id, {}).get("result") or {}).get("results", []):
+            if r["target"] in patches:
+                r.update(patches[r["target"]])
+                updated += 1
+        return updated
+
+
+class FakeJobQueue:
+    def __init__(self):
+        self.jobs = []
+
+    def enqueue(self, task_name, *, args=None, kwargs=None):
+        self.jobs.append((task_name, args, kwargs))
+        return f"job-{len(self.jobs)}"
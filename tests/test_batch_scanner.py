@@ -0,0 +1,183 @@
+# tests/test_batch_scanner.py
+import asyncio
+import io
+import json
+import queue
+
+import pytest
+
+from app.adapters.cli.batch_scanner import (
+    _DONE,
+    _ROW,
+    _Checkpoint,
+    _collect,
+    _LineWork,
+    _ShuffledWork,
+    _worker_loop,
+    main,
+    run,
+)
+from app.adapters.system.target_expander_impl import JobSpace
+from app.domain.permutation import CyclicPermutation
+from app.domain.scan_service import ScanResultDTO, ScanService
+
+
+class FakeService:
+    def new_context(self):
+        return None
+
+    async def probe(self, ctx, host, port):
+        if host == "down.example":
+            raise ConnectionRefusedError("refused")
+        return ScanResultDTO(f"{host}:{port}", "http", 3, "m" * 32, 200, None, [])
+
+    error_for = staticmethod(ScanService.error_for)
+
+
+def _drain(q):
+    out = []
+    while not q.empty():
+        out.append(q.get())
+    return out
+
+
+async def test_worker_loop_streams_rows_and_marks_lines_done():
+    in_q, out_q = queue.Queue(), queue.Queue()
+    in_q.put([(0, "10.0.0.0/30"), (1, "down.example")])
+    in_q.put(None)
+
+    await _worker_loop(FakeService(), _LineWork([80, 443]), in_q, out_q)
+
+    msgs = _drain(out_q)
+    rows = [json.loads(p) for k, p in msgs if k == _ROW]
+    assert sorted(p for k, p in msgs if k == _DONE) == [0, 1]
+    assert {r["target"] for r in rows if r["offset"] == 0} == {
+        "10.0.0.1:80", "10.0.0.1:443", "10.0.0.2:80", "10.0.0.2:443",
+    }  # fmt: skip
+    assert [r["error"] for r in rows if r["offset"] == 1] == ["ConnectionRefusedError"] * 2
+
+
+async def test_worker_loop_keeps_running_while_the_out_queue_is_full():
+    in_q, out_q = queue.Queue(), queue.Queue(maxsize=1)
+    in_q.put([(0, "10.0.0.0/29")])
+    in_q.put(None)
+    ticks = 0
+
+    async def _tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(_tick())
+    worker = asyncio.create_task(_worker_loop(FakeService(), _LineWork([80]), in_q, out_q))
+    await asyncio.sleep(0.2)  # nobody drains out_q yet
+    assert ticks >= 10 and not worker.done()
+
+    msgs = []
+    while not worker.done():
+        msgs += _drain(out_q)
+        await asyncio.sleep(0.01)
+    msgs += _drain(out_q)
+    ticker.cancel()
+    assert [k for k, _ in msgs] == [_ROW] * 6 + [_DONE]
+
+
+def test_shuffled_blocks_of_all_shards_cover_the_space_once():
+    space = JobSpace(["10.0.0.0/28", "example.com"], [80, 443, 8080])
+    perm = CyclicPermutation(space.size, seed=5)
+    pairs = []
+    for shard in range(3):
+        work = _ShuffledWork(space, perm, 4, shard, 3)
+        pairs += [pair for k in range(work.blocks) for pair in work(k)]
+    assert sorted(pairs) == sorted(space.pair_at(i) for i in range(space.size))
+
+
+def test_checkpoint_watermark_persists_and_resumes(tmp_path):
+    state = tmp_path / "scan.state"
+    cp = _Checkpoint(str(state))
+    for offset in (0, 2, 3):
+        cp.complete(offset)
+    assert cp.next_offset == 1
+    cp.complete(1)
+    cp.save()
+    assert _Checkpoint(str(state)).next_offset == 4
+
+
+def test_run_end_to_end_with_state(tmp_path):
+    targets = tmp_path / "targets.txt"
+    targets.write_text("127.0.0.1\n# comment\n\n127.0.0.2\n")
+    state = tmp_path / "scan.state"
+    out = io.StringIO()
+
+    rows = run(input_path=str(targets), out=out, ports=[1], procs=2, state=str(state))
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert rows == 2 and {r["offset"] for r in lines} == {0, 3}
+    assert all(r["target"].endswith(":1") and "error" in r for r in lines)
+    assert json.loads(state.read_text()) == {"next_offset": 4}
+
+    # resuming a finished run scans nothing
+    assert (
+        run(input_path=str(targets), out=io.StringIO(), ports=[1], procs=1, state=str(state)) == 0
+    )
+
+
+def test_run_shuffled_covers_space_once_and_pins_seed(tmp_path):
+    targets = tmp_path / "targets.txt"
+    targets.write_text("127.0.0.0/29\n")
+    state = tmp_path / "scan.state"
+    opts = {"input_path": str(targets), "ports": [1, 2], "state": str(state), "block": 4}
+    out = io.StringIO()
+
+    rows = run(out=out, procs=2, shuffle=True, **opts)
+
+    seen = [json.loads(line)["target"] for line in out.getvalue().splitlines()]
+    assert rows == 12 and len(set(seen)) == 12
+    saved = json.loads(state.read_text())
+    assert saved["next_offset"] == 3 and isinstance(saved["seed"], int)
+
+    # resume reuses the recorded seed; a different one, or line mode, is refused
+    assert run(out=io.StringIO(), procs=1, shuffle=True, **opts) == 0
+    with pytest.raises(ValueError):
+        run(out=io.StringIO(), procs=1, shuffle=True, seed=saved["seed"] + 1, **opts)
+    with pytest.raises(ValueError):
+        run(out=io.StringIO(), procs=1, **opts)
+
+
+def test_run_fails_fast_on_unreadable_input(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        run(input_path=str(tmp_path / "missing.txt"), out=io.StringIO(), ports=[1], procs=1)
+
+    # a read error on the reader thread stops the run instead of hanging it
+    targets = tmp_path / "targets.txt"
+    targets.write_bytes(b"127.0.0.1\n\xff\xfe\n")
+    with pytest.raises(RuntimeError, match="reading input"):
+        run(input_path=str(targets), out=io.StringIO(), ports=[1], procs=1)
+
+
+class KilledWorker:
+    def __init__(self):
+        self.pid, self.exitcode = 4242, -9  # SIGKILLed before it could report
+        self.terminated = False
+
+    def terminate(self):
+        self.terminated = True
+
+
+def test_collect_fails_when_a_worker_dies_silently(tmp_path):
+    out_q, worker = queue.Queue(), KilledWorker()
+    out_q.put((_DONE, 0))
+    checkpoint = _Checkpoint(str(tmp_path / "scan.state"))
+
+    with pytest.raises(RuntimeError, match="exited with code -9"):
+        _collect(io.StringIO(), out_q, [worker], checkpoint)
+
+    assert worker.terminated
+    assert json.loads((tmp_path / "scan.state").read_text()) == {"next_offset": 1}
+
+
+def test_shard_is_refused_without_shuffle(capsys):
+    with pytest.raises(SystemExit):
+        main(["--shard", "1/2"])
+    assert "--shard needs --shuffle" in capsys.readouterr().err
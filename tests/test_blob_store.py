@@ -0,0 +1,68 @@
+# tests/test_blob_store.py
+import hashlib
+
+from app.adapters.repositories.rapid7_recog_repo import RecogIndex
+from app.adapters.system.fs_blob_store import FilesystemBlobStore
+from app.adapters.system.target_expander_impl import TargetExpander
+from app.domain.scan_service import ScanRequestDTO, ScanService
+from tests.fakes import FakeIndexRepo
+
+BODY = b"\x00\x00\x01\x00favicon"
+MD5 = hashlib.md5(BODY).hexdigest()
+SHA = hashlib.sha256(BODY).hexdigest()
+
+
+class SameBodyFetcher:
+    async def fetch(self, scheme, host, port, path):
+        return 200, BODY, f"{scheme}://{host}:{port}{path}"
+
+
+class CountingIndex:
+    def __init__(self, index):
+        self.index = index
+        self.version = index.version
+        self.lookups = 0
+
+    def lookup_md5(self, md5):
+        self.lookups += 1
+        return self.index.lookup_md5(md5)
+
+
+class CountingBlobs(FilesystemBlobStore):
+    def __init__(self, root):
+        super().__init__(root)
+        self.puts = 0
+
+    def put(self, digest, body):
+        self.puts += 1
+        return super().put(digest, body)
+
+
+def test_fs_blob_store_writes_each_digest_once(tmp_path):
+    blobs = FilesystemBlobStore(str(tmp_path))
+    assert blobs.put(SHA, BODY) is True
+    assert blobs.put(SHA, BODY) is False
+    assert blobs.get(SHA) == BODY
+    assert blobs.get("0" * 64) is None
+    assert (tmp_path / SHA[:2] / SHA).is_file()
+
+
+async def test_scan_dedupes_lookup_and_storage_per_digest(tmp_path):
+    index = CountingIndex(RecogIndex("v1", {MD5: [{"name": "Thing", "properties": {}}]}))
+    blobs = CountingBlobs(str(tmp_path))
+    service = ScanService(
+        FakeIndexRepo(index),
+        SameBodyFetcher(),
+        TargetExpander(),
+        default_ports=[80],
+        max_targets=16,
+        blobs=blobs,
+    )
+
+    resp = await service.scan(ScanRequestDTO(targets=["10.0.0.0/29"], ports=[80, 8080]))
+
+    assert len(resp.results) == 12 and not resp.errors
+    assert {r.sha256 for r in resp.results} == {SHA}
+    assert all(r.matches[0]["name"] == "Thing" for r in resp.results)
+    assert index.lookups == 1
+    assert blobs.puts == 1
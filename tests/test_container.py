@@ -0,0 +1,36 @@
+# tests/test_container.py
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.adapters.api.fastapi_app import app, get_queue, get_store
+from tests.fakes import FakeJobQueue, InMemoryResultStore
+
+
+def test_api_import_does_not_load_worker_dependencies():
+    code = (
+        "import sys\n"
+        "from app.adapters.api import fastapi_app as m\n"
+        "m.get_store(); m.get_queue()\n"
+        "heavy = {'aiohttp', 'xmltodict', 'app.adapters.repositories.rapid7_recog_repo'}\n"
+        "print(sorted(heavy & set(sys.modules)))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_scan_enqueues_through_job_queue_port():
+    store, queue = InMemoryResultStore(), FakeJobQueue()
+    app.dependency_overrides[get_store] = lambda: store
+    app.dependency_overrides[get_queue] = lambda: queue
+    try:
+        r = TestClient(app).post("/scan", json={"targets": ["example.com"], "ports": [80]})
+    finally:
+        app.dependency_overrides.clear()
+
+    data = r.json()
+    assert data["job_id"] == "job-1"
+    assert store.get(data["scan_id"]) == {"status": "pending"}
+    task_name, args, _ = queue.jobs[0]
+    assert task_name == "scan_job" and args[0] == data["scan_id"]
@@ -0,0 +1,102 @@
+# tests/test_export.py
+import io
+import json
+from datetime import UTC, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.adapters.api.fastapi_app import app, get_exporter
+from app.domain.export_service import EXPORT_COLUMNS, ExportQueryDTO, ExportService
+from tests.fakes import InMemoryResultStore
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC).timestamp()
+DAY = 86400.0
+
+RABBIT = {
+    "name": "RabbitMQ",
+    "properties": {"service.vendor": "VMware", "service.product": "RabbitMQ"},
+}
+
+
+def _result(target, matches, md5="a" * 32):
+    return {"target": target, "scheme": "http", "bytes": 10, "md5": md5, "status": 200,
+            "final_url": f"http://{target}/favicon.ico", "matches": matches}  # fmt: skip
+
+
+@pytest.fixture
+def store():
+    s = InMemoryResultStore()
+    s.set_result(
+        "old",
+        {"results": [_result("10.0.0.1:80", [RABBIT])], "errors": []},
+        finished_at=T0,
+    )
+    s.set_result(
+        "new",
+        {
+            "results": [_result("10.0.0.2:15672", [RABBIT, {"name": "Other"}]),
+                        _result("2001:db8::1:443", [], md5=None)],
+            "errors": [{"target": "10.0.0.9:80", "error": "TimeoutError", "detail": ""}],
+        },
+        finished_at=T0 + DAY,
+    )  # fmt: skip
+    s.set_pending("running")
+    return s
+
+
+def test_rows_are_flat_per_match_and_filterable(store):
+    svc = ExportService(store)
+
+    rows = list(svc.rows(ExportQueryDTO()))
+    assert [(r["scan_id"], r["match_name"]) for r in rows] == [
+        ("old", "RabbitMQ"), ("new", "RabbitMQ"), ("new", "Other"), ("new", None),
+    ]  # fmt: skip
+    assert all(tuple(r) == EXPORT_COLUMNS for r in rows)
+    assert rows[0]["service_vendor"] == "VMware" and rows[0]["port"] == 80
+    assert json.loads(rows[0]["properties"]) == RABBIT["properties"]
+    assert (rows[3]["host"], rows[3]["port"]) == ("2001:db8::1", 443)
+
+    since = list(svc.rows(ExportQueryDTO(since=T0 + 1, include_errors=True)))
+    assert {r["scan_id"] for r in since} == {"new"}
+    assert [r["error"] for r in since if r["error"]] == ["TimeoutError"]
+
+    by_name = list(svc.rows(ExportQueryDTO(scan_ids=["new", "old"], match_names=["rabbitmq"])))
+    assert [r["scan_id"] for r in by_name] == ["new", "old"]
+
+    bounded = ExportQueryDTO(scan_ids=["old", "new", "running"], until=T0 + 1)
+    assert [r["scan_id"] for r in svc.rows(bounded)] == ["old"]
+
+
+@pytest.fixture
+def client(store):
+    app.dependency_overrides[get_exporter] = lambda: ExportService(store)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_export_streams_ndjson(client):
+    r = client.get("/export", params={"since": "2026-01-02T00:00:00", "match": "Other"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [(x["target"], x["match_name"]) for x in rows] == [("10.0.0.2:15672", "Other")]
+    assert rows[0]["finished_at"] == "2026-01-02T00:00:00+00:00"
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_export_columnar(client, fmt):
+    pa = pytest.importorskip("pyarrow")
+    r = client.get("/export", params={"format": fmt, "scan_id": ["old", "new"]})
+    assert r.status_code == 200
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(io.BytesIO(r.content))
+    else:
+        table = pa.ipc.open_stream(r.content).read_all()
+    assert table.column_names == list(EXPORT_COLUMNS)
+    assert table.num_rows == 4
+    assert table.column("match_name").to_pylist() == ["RabbitMQ", "RabbitMQ", "Other", None]
+    assert table.schema.field("finished_at").type == pa.timestamp("ms", tz="UTC")
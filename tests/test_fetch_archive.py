@@ -0,0 +1,110 @@
+# tests/test_fetch_archive.py
+import hashlib
+
+import pytest
+
+from app.adapters.http.fetch_archive import MAGIC, FetchArchiveWriter, iter_records, open_archive
+from app.adapters.http.recording_fetcher import RecordingFetcher
+from app.adapters.http.replay_fetcher import ReplayedFetchError, ReplayFetcher, ReplayMiss
+from app.adapters.repositories.rapid7_recog_repo import RecogIndex
+from app.adapters.system.target_expander_impl import TargetExpander
+from app.domain.scan_service import ScanRequestDTO, ScanService
+from tests.fakes import FakeIndexRepo
+
+ICON = b"\x00\x00\x01\x00icon"
+INDEX = RecogIndex("v1", {hashlib.md5(ICON).hexdigest(): [{"name": "Icon", "properties": {}}]})
+
+
+class ScriptedFetcher:
+    async def fetch(self, scheme, host, port, path):
+        if host.endswith(".4"):
+            raise ConnectionRefusedError("refused")
+        if host.endswith(".3"):
+            return 404, b"not found", f"{scheme}://{host}:{port}{path}"
+        return 200, ICON, f"{scheme}://{host}:{port}{path}"
+
+
+def _service(fetcher):
+    return ScanService(
+        FakeIndexRepo(INDEX), fetcher, TargetExpander(), default_ports=[80], max_targets=64
+    )
+
+
+def _by_target(rows):
+    return {r["target"]: r for r in rows}
+
+
+def _records(path):
+    with open_archive(path) as f:
+        return list(iter_records(f))
+
+
+async def test_replay_reproduces_recorded_scan(tmp_path):
+    path = tmp_path / "sweep.far"
+    req = ScanRequestDTO(targets=["10.0.0.0/29"], ports=[80, 443])
+
+    recorder = RecordingFetcher(ScriptedFetcher(), path)
+    live = await _service(recorder).scan(req)
+    await recorder.close()
+
+    records = _records(path)
+    assert len(records) == 12
+    assert sum(body is not None for _, _, body in records) == 2  # icon + 404 page, once each
+
+    replayed = await _service(ReplayFetcher(path)).scan(req)
+    assert _by_target(r.as_dict() for r in replayed.results) == _by_target(
+        r.as_dict() for r in live.results
+    )
+    assert _by_target(replayed.errors) == _by_target(live.errors)
+    assert {e["error"] for e in replayed.errors} == {"ConnectionRefusedError"}
+
+
+async def test_replay_miss_and_error_types(tmp_path):
+    path = tmp_path / "a.far"
+    w = FetchArchiveWriter(path)
+    w.append(("http", "h", 80, "/favicon.ico"), error=TimeoutError("slow"))
+    w.close()
+
+    replay = ReplayFetcher(path)
+    with pytest.raises(ReplayedFetchError) as excinfo:
+        await replay.fetch("http", "h", 80, "/favicon.ico")
+    assert excinfo.typename == "TimeoutError" and str(excinfo.value) == "slow"
+    with pytest.raises(ReplayMiss):
+        await replay.fetch("http", "h", 81, "/favicon.ico")
+
+
+def test_writer_reopens_keeps_dedupe_and_cuts_truncated_tail(tmp_path):
+    path = tmp_path / "a.far"
+    w = FetchArchiveWriter(path)
+    w.append(("http", "a", 80, "/"), status=200, body=ICON, final_url="http://a/")
+    w.append(("http", "b", 80, "/"), status=200, body=ICON, final_url="http://b/")
+    w.close()
+    size = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b"\x10\x00\x00\x00\x00\x00")  # crash mid-record
+
+    w = FetchArchiveWriter(path)
+    assert path.stat().st_size == size
+    w.append(("http", "c", 80, "/"), status=200, body=ICON, final_url="http://c/")
+    w.close()
+
+    records = _records(path)
+    assert [m["k"][1] for _, m, _ in records] == ["a", "b", "c"]
+    assert [body is not None for _, _, body in records] == [True, False, False]
+
+
+def test_damaged_record_is_refused_not_cut_off(tmp_path):
+    path = tmp_path / "a.far"
+    w = FetchArchiveWriter(path)
+    w.append(("http", "a", 80, "/"), status=200, body=ICON, final_url="http://a/")
+    w.append(("http", "b", 80, "/"), status=404, body=b"", final_url="http://b/")
+    w.close()
+    data = bytearray(path.read_bytes())
+    data[len(MAGIC) + 8 + 4] ^= 0xFF  # inside the first record's compressed meta
+    path.write_bytes(data)
+
+    with pytest.raises(ValueError, match=f"offset {len(MAGIC)}"):
+        FetchArchiveWriter(path)
+    assert path.read_bytes() == data
+    with pytest.raises(ValueError):
+        ReplayFetcher(path)
@@ -0,0 +1,184 @@
+# tests/test_http_fetcher_contract.py
+import gzip
+import shutil
+import ssl
+import subprocess
+
+import pytest
+from aiohttp import web
+
+from app.adapters.http.aiohttp_fetcher import AiohttpFetcher
+from app.adapters.http.asyncio_fetcher import AsyncioFetcher
+from app.adapters.http.tls import TLSClient
+from app.config import settings
+
+ICON = b"\x00\x00\x01\x00" + bytes(range(256)) * 4
+MAX_BYTES = 4096
+
+
+def AsyncioFetcherTLSThreads():  # noqa: N802  (named like the classes for test ids)
+    return AsyncioFetcher(TLSClient(handshake_threads=2))
+
+
+FETCHERS = [AiohttpFetcher, AsyncioFetcher, AsyncioFetcherTLSThreads]
+
+
+async def _icon(request):
+    return web.Response(body=ICON, content_type="image/x-icon")
+
+
+async def _chunked(request):
+    resp = web.StreamResponse()
+    resp.enable_chunked_encoding()
+    await resp.prepare(request)
+    for i in range(0, len(ICON), 100):
+        await resp.write(ICON[i : i + 100])
+    await resp.write_eof()
+    return resp
+
+
+async def _gzip(request):
+    return web.Response(body=gzip.compress(ICON), headers={"Content-Encoding": "gzip"})
+
+
+async def _close(request):
+    return web.Response(body=ICON, headers={"Connection": "close"})
+
+
+async def _big(request):
+    return web.Response(body=b"x" * (MAX_BYTES * 3))
+
+
+async def _missing(request):
+    return web.Response(status=404, text="nope")
+
+
+async def _redirect(request):
+    raise web.HTTPFound("/favicon.ico")
+
+
+async def _abs_redirect(request):
+    raise web.HTTPMovedPermanently(f"http://{request.host}/favicon.ico")
+
+
+async def _loop(request):
+    raise web.HTTPFound("/loop")
+
+
+def _app() -> web.Application:
+    app = web.Application()
+    app.router.add_get("/favicon.ico", _icon)
+    app.router.add_get("/close", _close)
+    app.router.add_get("/chunked", _chunked)
+    app.router.add_get("/gzip", _gzip)
+    app.router.add_get("/big", _big)
+    app.router.add_get("/missing", _missing)
+    app.router.add_get("/redirect", _redirect)
+    app.router.add_get("/abs-redirect", _abs_redirect)
+    app.router.add_get("/loop", _loop)
+    return app
+
+
+async def _serve(ssl_context=None):
+    runner = web.AppRunner(_app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=ssl_context)
+    await site.start()
+    return runner, runner.addresses[0][1]
+
+
+@pytest.fixture(autouse=True)
+def _limits(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_BYTES", MAX_BYTES)
+    monkeypatch.setattr(settings, "MAX_REDIRECTS", 3)
+    monkeypatch.setattr(settings, "RETRIES", 0)
+    monkeypatch.setattr(settings, "VERIFY_TLS", False)
+
+
+@pytest.fixture
+async def server():
+    runner, port = await _serve()
+    yield port
+    await runner.cleanup()
+
+
+@pytest.fixture
+async def tls_server(tmp_path):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl CLI not available to mint a test certificate")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )  # fmt: skip
+    ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ctx.load_cert_chain(cert, key)
+    runner, port = await _serve(ctx)
+    yield port
+    await runner.cleanup()
+
+
+@pytest.fixture(params=FETCHERS, ids=lambda f: f.__name__)
+async def fetcher(request):
+    f = request.param()
+    yield f
+    await f.close()
+
+
+@pytest.mark.parametrize("path", ["/favicon.ico", "/chunked", "/gzip"])
+async def test_fetch_returns_status_body_and_url(fetcher, server, path):
+    status, body, final_url = await fetcher.fetch("http", "127.0.0.1", server, path)
+    assert (status, body) == (200, ICON)
+    assert final_url == f"http://127.0.0.1:{server}{path}"
+
+
+@pytest.mark.parametrize("path", ["/redirect", "/abs-redirect"])
+async def test_fetch_follows_redirects(fetcher, server, path):
+    status, body, final_url = await fetcher.fetch("http", "127.0.0.1", server, path)
+    assert (status, body) == (200, ICON)
+    assert final_url == f"http://127.0.0.1:{server}/favicon.ico"
+
+
+async def test_fetch_caps_body_at_max_bytes(fetcher, server):
+    status, body, _ = await fetcher.fetch("http", "127.0.0.1", server, "/big")
+    assert status == 200 and body == b"x" * MAX_BYTES
+
+
+async def test_fetch_returns_error_statuses(fetcher, server):
+    status, body, _ = await fetcher.fetch("http", "127.0.0.1", server, "/missing")
+    assert (status, body) == (404, b"nope")
+
+
+async def test_fetch_bounds_redirects(fetcher, server):
+    with pytest.raises(Exception) as excinfo:
+        await fetcher.fetch("http", "127.0.0.1", server, "/loop")
+    assert excinfo.typename == "TooManyRedirects"
+
+
+async def test_fetch_raises_on_refused_connection(fetcher, server):
+    with pytest.raises(OSError):
+        await fetcher.fetch("http", "127.0.0.1", 1, "/favicon.ico")
+
+
+async def test_fetch_over_tls_without_verification(fetcher, tls_server):
+    status, body, final_url = await fetcher.fetch("https", "127.0.0.1", tls_server, "/favicon.ico")
+    assert (status, body) == (200, ICON)
+    assert final_url == f"https://127.0.0.1:{tls_server}/favicon.ico"
+
+
+async def test_tls_sessions_are_resumed_per_host(fetcher, tls_server):
+    for _ in range(3):
+        status, body, _ = await fetcher.fetch("https", "127.0.0.1", tls_server, "/close")
+        assert (status, body) == (200, ICON)
+    assert fetcher.tls.stats()["handshakes"] == 3
+    assert fetcher.tls.stats()["resumed"] == 2
+
+
+async def test_fetch_after_close_reuses_tls_sessions(fetcher, tls_server):
+    for _ in range(2):
+        status, body, _ = await fetcher.fetch("https", "127.0.0.1", tls_server, "/close")
+        assert (status, body) == (200, ICON)
+        await fetcher.close()
+    assert fetcher.tls.stats()["resumed"] == 1
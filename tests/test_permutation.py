@@ -0,0 +1,67 @@
+# tests/test_permutation.py
+from app.adapters.repositories.rapid7_recog_repo import RecogIndex
+from app.adapters.system.target_expander_impl import JobSpace, TargetExpander
+from app.domain.permutation import CyclicPermutation
+from app.domain.scan_service import ScanRequestDTO, ScanService
+from tests.fakes import FakeIndexRepo
+
+
+def test_permutation_is_complete_and_seeded():
+    for n in (0, 1, 2, 7, 1000):
+        assert sorted(CyclicPermutation(n, seed=3)) == list(range(n))
+
+    order = list(CyclicPermutation(1000, seed=3))
+    assert order == list(CyclicPermutation(1000, seed=3))
+    assert order != list(CyclicPermutation(1000, seed=4))
+    assert order != sorted(order)
+
+
+def test_position_ranges_are_disjoint_and_cover_everything():
+    perm = CyclicPermutation(500, seed=1)
+    strides = [list(perm.iter_range(k, perm.period, 3)) for k in range(3)]
+    assert sorted(x for s in strides for x in s) == list(range(500))
+
+    # consecutive blocks of positions are the same walk in pieces
+    blocks = [x for first in range(0, perm.period, 64) for x in perm.iter_range(first, first + 64)]
+    assert blocks == list(perm)
+
+
+def test_job_space_matches_iter_hosts():
+    inputs = ["10.0.0.0/29", "example.com", "192.0.2.7", "2001:db8::/126", "10.1.0.0/31"]
+    space = JobSpace(inputs, [80, 443])
+    hosts = list(TargetExpander.iter_hosts(inputs))
+    assert space.hosts == len(hosts)
+    assert [space.host_at(i) for i in range(space.hosts)] == hosts
+    assert space.pair_at(3) == (hosts[1], 443)
+
+    pairs = list(space.pairs(CyclicPermutation(space.size, seed=9)))
+    assert sorted(pairs) == sorted((h, p) for h in hosts for p in (80, 443))
+
+
+class RecordingFetcher:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, scheme, host, port, path):
+        self.calls.append((host, port))
+        return 404, b"", f"{scheme}://{host}:{port}{path}"
+
+
+async def test_random_traversal_probes_every_pair_once_in_shuffled_order():
+    fetcher = RecordingFetcher()
+    service = ScanService(
+        FakeIndexRepo(RecogIndex("v0", {})),
+        fetcher,
+        TargetExpander(),
+        default_ports=[80],
+        max_targets=64,
+        traversal="random",
+        seed=5,
+    )
+
+    resp = await service.scan(ScanRequestDTO(targets=["10.0.0.0/28"], ports=[80, 443, 8080]))
+
+    expected = [(f"10.0.0.{i}", p) for i in range(1, 15) for p in (80, 443, 8080)]
+    assert len(resp.results) + len(resp.errors) == len(expected)
+    assert sorted(fetcher.calls) == sorted(expected)
+    assert fetcher.calls != expected
@@ -0,0 +1,62 @@
+# tests/test_recog_reload.py
+import logging
+
+from app.adapters.repositories.rapid7_recog_repo import Rapid7RecogRepository
+
+MD5_A = "a" * 32
+MD5_B = "b" * 32
+
+
+def _xml(*entries: tuple[str, str]) -> str:
+    fps = "".join(
+        f'<fingerprint pattern="^{md5}$"><description>{name}</description>'
+        f'<param pos="0" name="service.product" value="{name}"/></fingerprint>'
+        for md5, name in entries
+    )
+    return f'<?xml version="1.0"?><fingerprints matches="favicon.md5">{fps}</fingerprints>'
+
+
+def test_reload_swaps_index_and_version(tmp_path):
+    path = tmp_path / "favicons.xml"
+    path.write_text(_xml((MD5_A, "Alpha")))
+    repo = Rapid7RecogRepository(str(path))
+    held = repo.snapshot()
+    assert repo.lookup_md5(MD5_A)[0]["name"] == "Alpha"
+    assert repo.lookup_md5(MD5_B) == []
+
+    path.write_text(_xml((MD5_A, "Alpha"), (MD5_B, "Beta")))
+    assert repo.reload_if_changed() is True
+    assert repo.version != held.version
+    assert repo.lookup_md5(MD5_B)[0]["name"] == "Beta"
+    # a snapshot taken before the swap keeps answering from the old version
+    assert held.lookup_md5(MD5_B) == []
+
+
+def test_unchanged_or_broken_file_keeps_current_index(tmp_path):
+    path = tmp_path / "favicons.xml"
+    path.write_text(_xml((MD5_A, "Alpha")))
+    repo = Rapid7RecogRepository(str(path))
+    version = repo.version
+
+    assert repo.reload() is False
+
+    path.write_text("<fingerprints><fingerprint pattern=")
+    assert repo.reload_if_changed() is False
+    assert repo.version == version
+    assert repo.lookup_md5(MD5_A)
+
+
+def test_broken_file_is_retried_only_after_it_changes(tmp_path, caplog):
+    path = tmp_path / "favicons.xml"
+    path.write_text(_xml((MD5_A, "Alpha")))
+    repo = Rapid7RecogRepository(str(path))
+
+    path.write_text("<fingerprints><fingerprint pattern=")
+    with caplog.at_level(logging.ERROR):
+        for _ in range(3):
+            assert repo.reload_if_changed() is False
+    assert [r.getMessage() for r in caplog.records].count("recog reload failed") == 1
+
+    path.write_text(_xml((MD5_A, "Alpha"), (MD5_B, "Beta")))
+    assert repo.reload_if_changed() is True
+    assert repo.lookup_md5(MD5_B)[0]["name"] == "Beta"
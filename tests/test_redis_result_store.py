@@ -1,4 +1,6 @@
 # tests/test_redis_result_store.py
+import json
+
 import pytest
 
 from app.adapters.system.redis_result_store import RedisResultStore
@@ -9,11 +11,57 @@ class FakeRedis:
         self.db = {}
 
     def hset(self, key, mapping):
-        self.db[key] = mapping
+        self.db.setdefault(key, {}).update(mapping)
+
+    def hget(self, key, field):
+        return self.db.get(key, {}).get(field)
 
     def hgetall(self, key):
         return self.db.get(key, {})
 
+    def sadd(self, key, *members):
+        self.db.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        return set(self.db.get(key, set()))
+
+    def zadd(self, key, mapping):
+        self.db.setdefault(key, {}).update(mapping)
+
+    def zrangebyscore(self, key, lo, hi, start=0, num=None):
+        lo, hi = float(lo), float(hi)
+        ids = [m for m, sc in sorted(self.db.get(key, {}).items(), key=lambda kv: kv[1])
+               if lo <= sc <= hi]  # fmt: skip
+        return ids[start : start + num] if num is not None else ids[start:]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def transaction(self, func, *watches, value_from_callable=False):
+        self.watched = watches
+        pipe = FakePipeline(self, immediate=True)
+        value = func(pipe)
+        results = pipe.execute()
+        return value if value_from_callable else results
+
+
+class FakePipeline:
+    def __init__(self, r, immediate=False):
+        self._r = r
+        self._ops = []
+        self._immediate = immediate  # WATCH mode: commands run until multi()
+
+    def multi(self):
+        self._immediate = False
+
+    def __getattr__(self, name):
+        if self._immediate:
+            return getattr(self._r, name)
+        return lambda *a, **kw: self._ops.append((name, a, kw))
+
+    def execute(self):
+        return [getattr(self._r, name)(*a, **kw) for name, a, kw in self._ops]
+
 
 @pytest.fixture
 def store():
@@ -32,3 +80,53 @@ def test_set_and_get(store):
     assert r.hgetall("scan:id1")["status"] == "pending"
     assert r.hgetall("scan:id2")["status"] == "error"
     assert r.hgetall("scan:id3")["status"] == "done" or "result" in r.hgetall("scan:id3")
+
+
+def test_set_result_maintains_md5_reverse_index(store):
+    s, _ = store
+    s.set_result(
+        "id1",
+        {
+            "results": [
+                {"target": "10.0.0.1:80", "md5": "a" * 32, "matches": []},
+                {"target": "10.0.0.2:80", "md5": None, "matches": []},
+            ],
+            "errors": [],
+        },
+    )
+    s.set_result("id2", {"results": [{"target": "h:443", "md5": "a" * 32, "matches": []}]})
+
+    hits = s.targets_for_md5s(["a" * 32, "b" * 32])
+    assert hits == {"id1": {"10.0.0.1:80": "a" * 32}, "id2": {"h:443": "a" * 32}}
+
+
+def test_patch_results_updates_only_named_targets(store):
+    s, r = store
+    s.set_result(
+        "id1",
+        {
+            "results": [
+                {"target": "a:80", "md5": "a" * 32, "matches": []},
+                {"target": "b:80", "md5": "b" * 32, "matches": []},
+            ]
+        },
+    )
+    assert s.patch_results("id1", {"a:80": {"matches": [{"name": "X"}]}}) == 1
+    assert r.watched == ("scan:id1",)
+    assert s.patch_results("missing", {"a:80": {}}) == 0
+
+    stored = r.hgetall("scan:id1")
+    results = json.loads(stored["result"])["results"]
+    assert stored["status"] == "done"
+    assert results[0]["matches"] == [{"name": "X"}] and results[1]["matches"] == []
+
+
+def test_finished_between_pages_through_time_index(store, monkeypatch):
+    s, _ = store
+    for i in range(5):
+        monkeypatch.setattr("time.time", lambda i=i: 1000.0 + i)
+        s.set_result(f"id{i}", {"results": []})
+
+    assert list(s.finished_between(None, None, page=2)) == [f"id{i}" for i in range(5)]
+    assert list(s.finished_between(1001.0, 1003.0, page=2)) == ["id1", "id2", "id3"]
+    assert s.get("id4")["finished_at"] == 1004.0
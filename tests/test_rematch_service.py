@@ -0,0 +1,96 @@
+# tests/test_rematch_service.py
+import pytest
+
+from app.adapters.repositories.rapid7_recog_repo import (
+    FixedIndexRepository,
+    Rapid7RecogRepository,
+    RecogIndex,
+    diff_md5s,
+)
+from app.adapters.system import container
+from app.domain.rematch_service import RematchService
+from tests.fakes import FakeIndexRepo, InMemoryResultStore
+
+MD5_A = "a" * 32
+MD5_B = "b" * 32
+MD5_C = "c" * 32
+
+
+def _fp(name):
+    return [{"name": name, "properties": {}}]
+
+
+def test_diff_md5s_reports_added_changed_and_removed():
+    old = RecogIndex("v1", {MD5_A: _fp("A"), MD5_B: _fp("B")})
+    new = RecogIndex("v2", {MD5_A: _fp("A"), MD5_B: _fp("B2"), MD5_C: _fp("C")})
+    assert diff_md5s(old, new) == {MD5_B, MD5_C}
+    assert diff_md5s(new, old) == {MD5_B, MD5_C}
+
+
+def test_rematch_updates_only_affected_results():
+    store = InMemoryResultStore()
+    store.set_result(
+        "s1",
+        {
+            "results": [
+                {"target": "h1:80", "md5": MD5_C, "matches": [], "db_version": "v1"},
+                {"target": "h2:80", "md5": MD5_A, "matches": _fp("A"), "db_version": "v1"},
+            ]
+        },
+    )
+    store.set_result("s2", {"results": [{"target": "h3:80", "md5": MD5_A, "matches": []}]})
+    repo = FakeIndexRepo(RecogIndex("v2", {MD5_A: _fp("A"), MD5_C: _fp("C")}))
+
+    report = RematchService(repo, store).rematch([MD5_C.upper()])
+
+    assert (report.db_version, report.scans, report.results) == ("v2", 1, 1)
+    h1, h2 = store.get("s1")["result"]["results"]
+    assert h1["matches"] == _fp("C") and h1["db_version"] == "v2"
+    assert h2["db_version"] == "v1"
+    assert store.get("s2")["result"]["results"][0]["matches"] == []
+
+
+def test_rematch_applies_a_fixed_parsed_index():
+    store = InMemoryResultStore()
+    store.set_result("s1", {"results": [{"target": "h1:80", "md5": MD5_C, "matches": []}]})
+    new = RecogIndex("v2", {MD5_C: _fp("C")})
+
+    report = RematchService(FixedIndexRepository(new), store).rematch([MD5_C])
+
+    assert (report.db_version, report.results) == ("v2", 1)
+    assert store.get("s1")["result"]["results"][0]["matches"] == _fp("C")
+
+
+def test_rematch_job_waits_only_while_the_worker_has_the_old_db(monkeypatch):
+    from app.adapters.system.celery_app import rematch_job
+
+    store = InMemoryResultStore()
+    store.set_result("s1", {"results": [{"target": "h1:80", "md5": MD5_C, "matches": []}]})
+    repo = FakeIndexRepo(RecogIndex("v1", {}))
+    monkeypatch.setattr(container, "rematch_service", lambda: RematchService(repo, store))
+
+    with pytest.raises(RuntimeError, match="still v1"):
+        rematch_job.run([MD5_C], "v1")
+
+    repo.index = RecogIndex("v3", {MD5_C: _fp("C")})  # newer than the diffed NEW.xml
+    assert rematch_job.run([MD5_C], "v1")["db_version"] == "v3"
+    assert store.get("s1")["result"]["results"][0]["matches"] == _fp("C")
+
+
+def test_rematch_job_reloads_the_file_without_a_watcher(tmp_path, monkeypatch):
+    from app.adapters.system.celery_app import rematch_job
+
+    path = tmp_path / "favicons.xml"
+    path.write_text('<fingerprints matches="favicon.md5"></fingerprints>')
+    repo = Rapid7RecogRepository(str(path))  # never start_watching()
+    old_version = repo.version
+    store = InMemoryResultStore()
+    store.set_result("s1", {"results": [{"target": "h1:80", "md5": MD5_C, "matches": []}]})
+    monkeypatch.setattr(container, "rematch_service", lambda: RematchService(repo, store))
+
+    path.write_text(
+        f'<fingerprints matches="favicon.md5"><fingerprint pattern="^{MD5_C}$">'
+        "<description>C</description></fingerprint></fingerprints>"
+    )
+    assert rematch_job.run([MD5_C], old_version)["results"] == 1
+    assert store.get("s1")["result"]["results"][0]["matches"][0]["name"] == "C"